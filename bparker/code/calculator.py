@@ -1,6 +1,10 @@
 """Simple Calculator"""
+import operator as op
 import sys
 
+# Map each operator symbol to the function that computes it
+OPS = {"+": op.add, "-": op.sub, "*": op.mul, "/": op.truediv}
+
 # Get inputs (from command line or prompts)
 if len(sys.argv) == 4:
     num1 = float(sys.argv[1])
@@ -12,20 +16,15 @@ else:
     operator = input("Enter operator (+, -, *, /): ")
 
 # Calculate based on operator
-if operator == "+":
-    result = num1 + num2
-elif operator == "-":
-    result = num1 - num2
-elif operator == "*":
-    result = num1 * num2
-elif operator == "/":
-    if num2 == 0:
-        print("Error: Cannot divide by zero")
-        exit()
-    result = num1 / num2
-else:
+if operator == "/" and num2 == 0:
+    print("Error: Cannot divide by zero")
+    exit()
+
+fn = OPS.get(operator)
+if fn is None:
     print(f"Error: Unknown operator '{operator}'")
     exit()
+result = fn(num1, num2)
 
 # Print result
 print(f"{num1} {operator} {num2} = {result}")
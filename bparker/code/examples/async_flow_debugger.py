@@ -10,6 +10,7 @@ Usage:
     python async_flow_debugger.py --list-all
 """
 
+from operator import itemgetter
 from typing import TypedDict
 import argparse
 
@@ -113,6 +114,44 @@ ASYNC_FLOWS: AsyncFlows = {
 # Debugging Functions
 # =============================================================================
 
+# Every flow as a (touches, formatted description) pair, in display order.
+# ASYNC_FLOWS is static, so the descriptions are formatted once here.
+_WRITERS: tuple[tuple[list[str], str], ...] = (
+    *(
+        (task["touches"], f"⏰ Scheduled: {task['name']} (cron: {task['schedule']})")
+        for task in ASYNC_FLOWS["scheduled_tasks"]
+    ),
+    *(
+        (handler["touches"], f"🔔 Event: {handler['event']} → {handler['handler']}")
+        for handler in ASYNC_FLOWS["event_handlers"]
+    ),
+    *(
+        (job["touches"], f"🔄 Job: {job['name']} (queue: {job['queue']})")
+        for job in ASYNC_FLOWS["background_jobs"]
+    ),
+)
+
+# Inverted index: field -> pre-formatted writer descriptions, so lookups
+# don't rescan every flow.
+_FIELD_WRITERS: dict[str, list[str]] = {}
+
+
+def _build_index() -> None:
+    """Populate _FIELD_WRITERS from _WRITERS (called once at module load)."""
+    for touches, formatted in _WRITERS:
+        for field in touches:
+            _FIELD_WRITERS.setdefault(field, []).append(formatted)
+
+
+_build_index()
+
+# Every field touched by at least one flow, for O(1) rejection of unknown fields
+_ALL_TOUCHED: frozenset[str] = frozenset(_FIELD_WRITERS)
+
+# The same fields in display order, sorted once
+_SORTED_FIELDS: tuple[str, ...] = tuple(sorted(_ALL_TOUCHED))
+
+
 def find_writers(field: str) -> list[str]:
     """
     Find all async processes that touch a given field.
@@ -127,43 +166,20 @@ def find_writers(field: str) -> list[str]:
         >>> find_writers("balance")
         ['⏰ Scheduled: nightly_reconciliation (0 3 * * *)', ...]
     """
-    writers = []
-    
-    for task in ASYNC_FLOWS["scheduled_tasks"]:
-        if field in task["touches"]:
-            writers.append(
-                f"⏰ Scheduled: {task['name']} (cron: {task['schedule']})"
-            )
-    
-    for handler in ASYNC_FLOWS["event_handlers"]:
-        if field in handler["touches"]:
-            writers.append(
-                f"🔔 Event: {handler['event']} → {handler['handler']}"
-            )
-    
-    for job in ASYNC_FLOWS["background_jobs"]:
-        if field in job["touches"]:
-            writers.append(
-                f"🔄 Job: {job['name']} (queue: {job['queue']})"
-            )
-    
-    return writers
+    if field not in _ALL_TOUCHED:
+        return []
+    return list(_FIELD_WRITERS[field])
 
 
-def get_all_fields() -> set[str]:
+def get_all_fields() -> frozenset[str]:
     """Get all unique fields that are touched by any async process."""
-    fields: set[str] = set()
-    
-    for task in ASYNC_FLOWS["scheduled_tasks"]:
-        fields.update(task["touches"])
-    
-    for handler in ASYNC_FLOWS["event_handlers"]:
-        fields.update(handler["touches"])
-    
-    for job in ASYNC_FLOWS["background_jobs"]:
-        fields.update(job["touches"])
-    
-    return fields
+    return _ALL_TOUCHED
+
+
+# Pull every displayed key out of a flow entry in one call
+_task_fields = itemgetter("name", "schedule", "touches")
+_handler_fields = itemgetter("event", "handler", "touches")
+_job_fields = itemgetter("name", "queue", "touches")
 
 
 def print_all_flows() -> None:
@@ -174,31 +190,30 @@ def print_all_flows() -> None:
     
     print("\n⏰ SCHEDULED TASKS")
     print("-" * 40)
-    for task in ASYNC_FLOWS["scheduled_tasks"]:
-        print(f"  {task['name']}")
-        print(f"    Schedule: {task['schedule']}")
-        print(f"    Touches:  {', '.join(task['touches'])}")
+    for name, schedule, touches in map(_task_fields, ASYNC_FLOWS["scheduled_tasks"]):
+        print(f"  {name}")
+        print(f"    Schedule: {schedule}")
+        print(f"    Touches:  {', '.join(touches)}")
         print()
     
     print("🔔 EVENT HANDLERS")
     print("-" * 40)
-    for handler in ASYNC_FLOWS["event_handlers"]:
-        print(f"  {handler['event']} → {handler['handler']}")
-        print(f"    Touches: {', '.join(handler['touches'])}")
+    for event, handler, touches in map(_handler_fields, ASYNC_FLOWS["event_handlers"]):
+        print(f"  {event} → {handler}")
+        print(f"    Touches: {', '.join(touches)}")
         print()
     
     print("🔄 BACKGROUND JOBS")
     print("-" * 40)
-    for job in ASYNC_FLOWS["background_jobs"]:
-        print(f"  {job['name']} (queue: {job['queue']})")
-        print(f"    Touches: {', '.join(job['touches'])}")
+    for name, queue, touches in map(_job_fields, ASYNC_FLOWS["background_jobs"]):
+        print(f"  {name} (queue: {queue})")
+        print(f"    Touches: {', '.join(touches)}")
         print()
     
     print("📊 ALL TRACKED FIELDS")
     print("-" * 40)
-    for field in sorted(get_all_fields()):
-        writers = find_writers(field)
-        print(f"  {field}: {len(writers)} writer(s)")
+    for field in _SORTED_FIELDS:
+        print(f"  {field}: {len(_FIELD_WRITERS[field])} writer(s)")
 
 
 def debug_field(field: str) -> None:
@@ -209,7 +224,7 @@ def debug_field(field: str) -> None:
     
     if not writers:
         print(f"  ⚠️  No async processes found that touch '{field}'")
-        print(f"\n  Available fields: {', '.join(sorted(get_all_fields()))}")
+        print(f"\n  Available fields: {', '.join(_SORTED_FIELDS)}")
     else:
         print(f"  Found {len(writers)} async process(es):\n")
         for writer in writers:
@@ -259,7 +274,7 @@ Examples:
         print_all_flows()
     elif args.fields:
         print("\n📊 Tracked fields:")
-        for field in sorted(get_all_fields()):
+        for field in _SORTED_FIELDS:
             print(f"  • {field}")
         print()
     elif args.field:
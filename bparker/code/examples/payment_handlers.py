@@ -13,6 +13,7 @@ This implements the handlers referenced in ASYNC_FLOWS:
 - process_refund (background job)
 """
 
+import sys
 import time
 import random
 import logging
@@ -36,6 +37,10 @@ logging.basicConfig(
 
 logger = logging.getLogger("payment_handlers")
 
+# Decimal is immutable, so shared zero constants are safe to reuse
+_ZERO = Decimal("0")
+_ZERO_2DP = Decimal("0.00")
+
 
 # =============================================================================
 # Custom Exceptions
@@ -75,7 +80,7 @@ class BalanceUpdateError(Exception):
 # Metrics Collection
 # =============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class PaymentMetrics:
     """Metrics for payment operations."""
     
@@ -94,8 +99,8 @@ class PaymentMetrics:
     total_latency_ms: float = 0.0
     
     # Amount tracking
-    total_amount_processed: Decimal = field(default_factory=lambda: Decimal("0.00"))
-    total_refunded: Decimal = field(default_factory=lambda: Decimal("0.00"))
+    total_amount_processed: Decimal = field(default_factory=lambda: _ZERO_2DP)
+    total_refunded: Decimal = field(default_factory=lambda: _ZERO_2DP)
     
     def record_payment(self, success: bool, amount: Decimal, latency_ms: float, retries: int = 0) -> None:
         """Record a payment processing attempt."""
@@ -172,7 +177,7 @@ class CircuitState(Enum):
     HALF_OPEN = "HALF_OPEN"
 
 
-@dataclass
+@dataclass(slots=True)
 class CircuitBreaker:
     """Circuit breaker with logging and metrics."""
     
@@ -188,18 +193,24 @@ class CircuitBreaker:
     
     @property
     def state(self) -> CircuitState:
-        if self._state == CircuitState.OPEN and self._last_failure_time:
-            if time.time() - self._last_failure_time >= self.recovery_timeout:
+        return self._current_state(time.monotonic())
+    
+    def _current_state(self, now: float) -> CircuitState:
+        """Resolve the state at monotonic time `now` (OPEN may become HALF_OPEN)."""
+        if self._state == CircuitState.OPEN and self._last_failure_time is not None:
+            if now - self._last_failure_time >= self.recovery_timeout:
                 logger.info("[%s] Circuit transitioning OPEN → HALF_OPEN", self.name)
                 self._state = CircuitState.HALF_OPEN
                 self._half_open_calls = 0
         return self._state
     
     def call(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
-        current_state = self.state
+        # Read the clock once and reuse it for both the state check and the log
+        now = time.monotonic()
+        current_state = self._current_state(now)
         
         if current_state == CircuitState.OPEN:
-            time_remaining = self.recovery_timeout - (time.time() - (self._last_failure_time or 0))
+            time_remaining = self.recovery_timeout - (now - (self._last_failure_time or now))
             logger.warning(
                 "[%s] Circuit OPEN - rejecting call (recovery in %.1fs)",
                 self.name, time_remaining
@@ -231,11 +242,12 @@ class CircuitBreaker:
     
     def _on_failure(self, error: Exception) -> None:
         self._failures += 1
-        self._last_failure_time = time.time()
+        self._last_failure_time = time.monotonic()
         
+        # %.100s truncates lazily, only if the record is actually emitted
         logger.warning(
-            "[%s] Failure %d/%d: %s",
-            self.name, self._failures, self.failure_threshold, str(error)[:100]
+            "[%s] Failure %d/%d: %.100s",
+            self.name, self._failures, self.failure_threshold, error
         )
         
         if self._failures >= self.failure_threshold:
@@ -261,38 +273,46 @@ def retry_with_backoff(
 ) -> Callable[[Callable[..., T]], Callable[..., T]]:
     """Decorator for retry with exponential backoff."""
     
+    # The schedule only depends on the decorator arguments, so build it once
+    delays = tuple(
+        min(base_delay * (exponential_base ** attempt), max_delay)
+        for attempt in range(max_retries)
+    )
+    
     def decorator(func: Callable[..., T]) -> Callable[..., T]:
+        func_name = func.__name__
+        
         @functools.wraps(func)
         def wrapper(*args: Any, **kwargs: Any) -> T:
-            last_exception: Optional[Exception] = None
+            # Fast path: most calls succeed first time, so skip the retry loop
+            try:
+                return func(*args, **kwargs)
+            except retryable_exceptions as e:
+                error = e
             
-            for attempt in range(max_retries + 1):
+            for attempt in range(max_retries):
+                delay = delays[attempt]
+                if jitter:
+                    delay *= (0.75 + random.random() * 0.5)
+                
+                logger.warning(
+                    "Retry %d/%d for %s in %.2fs: %s",
+                    attempt + 1, max_retries, func_name, delay, error
+                )
+                time.sleep(delay)
+                
                 try:
                     return func(*args, **kwargs)
-                    
                 except retryable_exceptions as e:
-                    last_exception = e
-                    
-                    if attempt == max_retries:
-                        logger.error(
-                            "Max retries (%d) exceeded for %s: %s",
-                            max_retries, func.__name__, e
-                        )
-                        raise MaxRetriesExceededError(
-                            f"Failed after {max_retries} retries: {e}"
-                        ) from e
-                    
-                    delay = min(base_delay * (exponential_base ** attempt), max_delay)
-                    if jitter:
-                        delay *= (0.75 + random.random() * 0.5)
-                    
-                    logger.warning(
-                        "Retry %d/%d for %s in %.2fs: %s",
-                        attempt + 1, max_retries, func.__name__, delay, e
-                    )
-                    time.sleep(delay)
+                    error = e
             
-            raise MaxRetriesExceededError(f"Unexpected: {last_exception}")
+            logger.error(
+                "Max retries (%d) exceeded for %s: %s",
+                max_retries, func_name, error
+            )
+            raise MaxRetriesExceededError(
+                f"Failed after {max_retries} retries: {error}"
+            ) from error
         
         return wrapper
     return decorator
@@ -302,10 +322,18 @@ def retry_with_backoff(
 # Mock Database & Services (Replace with real implementations)
 # =============================================================================
 
+def _fail_threshold(rate: float) -> int:
+    """Convert a failure rate into a threshold for `getrandbits(32)` comparisons."""
+    return int(rate * (1 << 32))
+
+
 class MockDatabase:
     """Mock database for demonstration."""
     
     def __init__(self):
+        # Per-instance RNG avoids contention on the module-level Random
+        self._rng = random.Random()
+        self._fail_threshold = _fail_threshold(0.1)  # 10% failure rate
         self._balances: dict[int, Decimal] = {
             1: Decimal("1000.00"),
             2: Decimal("500.00"),
@@ -314,12 +342,12 @@ class MockDatabase:
         self._audit_log: list[dict] = []
     
     def get_balance(self, user_id: int) -> Decimal:
-        if random.random() < 0.1:  # 10% failure rate
+        if self._rng.getrandbits(32) < self._fail_threshold:
             raise DatabaseError("Database connection timeout")
-        return self._balances.get(user_id, Decimal("0.00"))
+        return self._balances.get(user_id, _ZERO_2DP)
     
     def update_balance(self, user_id: int, new_balance: Decimal) -> None:
-        if random.random() < 0.1:
+        if self._rng.getrandbits(32) < self._fail_threshold:
             raise DatabaseError("Database write failed")
         self._balances[user_id] = new_balance
         logger.debug("DB: Updated balance for user %d to %.2f", user_id, new_balance)
@@ -333,17 +361,22 @@ class MockDatabase:
 class MockPaymentService:
     """Mock external payment service."""
     
+    def __init__(self):
+        self._rng = random.Random()
+        self._verify_fail_threshold = _fail_threshold(0.15)  # 15% failure rate
+        self._refund_fail_threshold = _fail_threshold(0.2)   # 20% failure rate
+    
     def verify_payment(self, payment_id: str) -> dict:
-        if random.random() < 0.15:  # 15% failure rate
+        if self._rng.getrandbits(32) < self._verify_fail_threshold:
             raise PaymentServiceError("Payment service unavailable")
         return {
             "payment_id": payment_id,
             "verified": True,
-            "amount": Decimal(str(random.randint(10, 500))),
+            "amount": Decimal(self._rng.randint(10, 500)),
         }
     
     def process_refund(self, payment_id: str, amount: Decimal) -> dict:
-        if random.random() < 0.2:  # 20% failure rate
+        if self._rng.getrandbits(32) < self._refund_fail_threshold:
             raise PaymentServiceError("Refund service unavailable")
         return {
             "refund_id": f"ref_{payment_id}",
@@ -380,11 +413,25 @@ ASYNC_FLOWS = {
     ],
 }
 
+# Only membership is ever checked here, so store each touch list as a frozenset
+for _flows in ASYNC_FLOWS.values():
+    for _flow in _flows:
+        _flow["touches"] = frozenset(_flow["touches"])
+
 
 # =============================================================================
 # Event Handlers (with retry, circuit breaker, logging, metrics)
 # =============================================================================
 
+def _to_decimal(value: Any) -> Decimal:
+    """Coerce a payload amount to Decimal, skipping str() parsing when possible."""
+    if type(value) is Decimal:
+        return value
+    if isinstance(value, int):
+        return Decimal(value)
+    return Decimal(str(value))
+
+
 @retry_with_backoff(max_retries=3, base_delay=0.5, retryable_exceptions=(TransientError,))
 def _fetch_and_verify_payment(payment_id: str) -> dict:
     """Fetch payment details with retry."""
@@ -477,7 +524,7 @@ def handle_payment_succeeded(event: dict) -> dict:
         
     except (CircuitOpenError, MaxRetriesExceededError) as e:
         latency_ms = (time.time() - start_time) * 1000
-        metrics.record_payment(success=False, amount=Decimal("0"), latency_ms=latency_ms)
+        metrics.record_payment(success=False, amount=_ZERO, latency_ms=latency_ms)
         
         logger.error(
             "FAILED | payment.succeeded | payment_id=%s error=%s",
@@ -543,7 +590,7 @@ def process_refund_job(job_data: dict) -> dict:
     """
     payment_id = job_data.get("payment_id")
     user_id = job_data.get("user_id")
-    amount = Decimal(str(job_data.get("amount", 0)))
+    amount = _to_decimal(job_data.get("amount", _ZERO))
     
     logger.info(
         "JOB | process_refund | payment_id=%s user_id=%s amount=%.2f",
@@ -591,15 +638,24 @@ def process_refund_job(job_data: dict) -> dict:
 # Demo
 # =============================================================================
 
+def _write_lines(lines: list[str]) -> None:
+    """Write a block of demo output in one buffered call."""
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
+
+
 def demo():
     """Demonstrate the payment handlers."""
-    print("\n" + "=" * 70)
-    print("💳 PAYMENT HANDLERS DEMO")
-    print("    With retry, circuit breaker, logging, and metrics")
-    print("=" * 70)
+    _write_lines([
+        "",
+        "=" * 70,
+        "💳 PAYMENT HANDLERS DEMO",
+        "    With retry, circuit breaker, logging, and metrics",
+        "=" * 70,
+    ])
     
     # Simulate payment.succeeded events
-    print("\n📥 Processing payment.succeeded events...\n")
+    _write_lines(["", "📥 Processing payment.succeeded events...", ""])
     
     for i in range(5):
         event = {
@@ -608,21 +664,21 @@ def demo():
         }
         
         result = handle_payment_succeeded(event)
-        print(f"  Payment {i+1}: {result['status']}")
-        time.sleep(0.3)
+        # Per event, so each result follows its own log lines
+        _write_lines([f"  Payment {i+1}: {result['status']}"])
     
     # Simulate a payment.failed event
-    print("\n📥 Processing payment.failed event...\n")
+    _write_lines(["", "📥 Processing payment.failed event...", ""])
     
     result = handle_payment_failed({
         "payment_id": "pay_006",
         "user_id": 1,
         "reason": "card_declined",
     })
-    print(f"  Result: {result}")
+    _write_lines([f"  Result: {result}"])
     
     # Simulate a refund job
-    print("\n📥 Processing refund job...\n")
+    _write_lines(["", "📥 Processing refund job...", ""])
     
     try:
         result = process_refund_job({
@@ -630,34 +686,29 @@ def demo():
             "user_id": 1,
             "amount": "50.00",
         })
-        print(f"  Refund: {result['status']}")
+        _write_lines([f"  Refund: {result['status']}"])
     except Exception as e:
-        print(f"  Refund failed: {e}")
+        _write_lines([f"  Refund failed: {e}"])
     
     # Print metrics
-    print("\n" + "=" * 70)
-    print("📊 METRICS SUMMARY")
-    print("=" * 70)
-    
-    for key, value in metrics.summary().items():
-        print(f"  {key}: {value}")
+    lines = ["", "=" * 70, "📊 METRICS SUMMARY", "=" * 70]
+    lines += [f"  {key}: {value}" for key, value in metrics.summary().items()]
     
     # Show what touches balance
-    print("\n" + "=" * 70)
-    print("🔍 ASYNC FLOWS THAT TOUCH 'balance'")
-    print("=" * 70)
+    lines += ["", "=" * 70, "🔍 ASYNC FLOWS THAT TOUCH 'balance'", "=" * 70]
     
     for category, flows in ASYNC_FLOWS.items():
         for flow in flows:
-            if "balance" in flow.get("touches", []):
+            if "balance" in flow.get("touches", ()):
                 if category == "scheduled_tasks":
-                    print(f"  ⏰ {flow['name']} ({flow['schedule']})")
+                    lines.append(f"  ⏰ {flow['name']} ({flow['schedule']})")
                 elif category == "event_handlers":
-                    print(f"  🔔 {flow['event']} → {flow['handler']}")
+                    lines.append(f"  🔔 {flow['event']} → {flow['handler']}")
                 elif category == "background_jobs":
-                    print(f"  🔄 {flow['name']} (queue: {flow['queue']})")
+                    lines.append(f"  🔄 {flow['name']} (queue: {flow['queue']})")
     
-    print()
+    lines.append("")
+    _write_lines(lines)
 
 
 if __name__ == "__main__":
@@ -8,25 +8,40 @@ Implements POST /payments endpoint with:
 - Comprehensive error handling
 - Partial failure reconciliation
 
+The Stripe path is async end-to-end, so a retry backoff awaits instead of
+blocking a worker thread.
+
 Edge Cases Handled:
 1. Stripe timeout → retry with backoff
 2. Stripe rate limit → queue and retry later
-3. Duplicate payment → idempotency key
+   (a circuit breaker fails fast while Stripe is down)
+3. Duplicate payment → caller-supplied idempotency key
 4. Card declined → user-friendly error
 5. Partial failure → reconciliation queue
 """
 
+import sys
+import json
 import time
 import uuid
-import hashlib
+import queue
+import bisect
+import random
+import asyncio
+import inspect
 import logging
 import functools
-from typing import Optional, Any
+import threading
+from collections import OrderedDict
+from typing import Optional, Any, Callable, TypeVar
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
-from decimal import Decimal
 from enum import Enum
 
+try:
+    import orjson  # Optional: C JSON encoder, much faster than json.dumps
+except ImportError:
+    orjson = None
+
 
 # =============================================================================
 # Logging
@@ -39,10 +54,23 @@ logging.basicConfig(
 logger = logging.getLogger("payment_service")
 
 
+def dumps_json(body: dict) -> bytes:
+    """Serialize a response body to compact JSON bytes (orjson if installed)."""
+    if orjson is not None:
+        return orjson.dumps(body)
+    return json.dumps(body, separators=(",", ":"), ensure_ascii=False).encode()
+
+
 # =============================================================================
 # Error Hierarchy (BaseAPIError pattern)
 # =============================================================================
 
+# Rendered error bodies keyed by (code, message, details). Bounded because
+# details can carry per-request ids; static errors fill it first.
+_ERROR_BODY_CACHE: dict[tuple, bytes] = {}
+_ERROR_BODY_CACHE_MAX = 256
+
+
 class BaseAPIError(Exception):
     """Base error with consistent API response format."""
     
@@ -68,6 +96,20 @@ class BaseAPIError(Exception):
                 "details": self.details,
             }
         }
+    
+    def to_response_bytes(self) -> bytes:
+        """Serialized `to_response()`, reused for repeated identical errors."""
+        try:
+            key = (self.code, self.message, tuple(self.details.items()))
+            body = _ERROR_BODY_CACHE.get(key)
+        except TypeError:  # Unhashable detail value; don't cache
+            return dumps_json(self.to_response())
+        
+        if body is None:
+            body = dumps_json(self.to_response())
+            if len(_ERROR_BODY_CACHE) < _ERROR_BODY_CACHE_MAX:
+                _ERROR_BODY_CACHE[key] = body
+        return body
 
 
 class ValidationError(BaseAPIError):
@@ -129,6 +171,20 @@ class PartialFailureError(BaseAPIError):
         )
 
 
+# Warm the cache with the fixed-message errors so no request pays to render them
+for _error in (
+    ValidationError("Amount must be greater than 0", field="amount"),
+    ValidationError("Amount exceeds maximum ($10,000)", field="amount"),
+    ValidationError("Unsupported currency", field="currency"),
+    ValidationError("Amount must be a number with at most 2 decimal places", field="amount"),
+    ValidationError("User not found", field="user_id"),
+    ValidationError("No valid payment method on file. Please add a card.", field="payment_method"),
+    PaymentServiceUnavailableError(retry_after=60),
+):
+    _error.to_response_bytes()
+del _error
+
+
 # =============================================================================
 # Retry Decorator
 # =============================================================================
@@ -150,110 +206,457 @@ class StripeRateLimitError(RetryableError):
         super().__init__(f"Rate limited. Retry after {retry_after}s")
 
 
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class RetryWakeup:
+    """
+    Backoff sleeps that `wake()` can end early.
+    
+    Owned by whatever makes retrying pointless (e.g. a CircuitBreaker that
+    just opened) and handed to `retry_with_backoff(wakeup=...)`, so waking
+    only cuts short the retries of that dependency.
+    """
+    
+    def __init__(self) -> None:
+        self._event = threading.Event()
+        self._async_waiters: set[asyncio.Future] = set()
+    
+    def wake(self) -> None:
+        """End every in-progress sleep now; the retry then re-attempts."""
+        self._event.set()
+        self._event.clear()
+        for waiter in list(self._async_waiters):
+            waiter.get_loop().call_soon_threadsafe(
+                lambda w=waiter: w.done() or w.set_result(None)
+            )
+    
+    def sleep(self, delay: float) -> None:
+        """time.sleep(delay) that wake() can cut short."""
+        self._event.wait(delay)
+    
+    async def async_sleep(self, delay: float) -> None:
+        """asyncio.sleep(delay) that wake() can cut short."""
+        waiter = asyncio.get_running_loop().create_future()
+        self._async_waiters.add(waiter)
+        try:
+            await asyncio.wait_for(waiter, timeout=delay)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            self._async_waiters.discard(waiter)
+
+
+# Private RNG for backoff jitter so retries don't share the module-level one
+_retry_rng = random.Random()
+
+
 def retry_with_backoff(
     max_retries: int = 3,
     base_delay: float = 1.0,
     max_delay: float = 30.0,
     exponential_base: float = 2.0,
-    retryable_exceptions: tuple = (RetryableError,),
-):
+    jitter: float = 0.5,
+    retryable_exceptions: tuple[type[BaseException], ...] = (RetryableError,),
+    wakeup: Optional[RetryWakeup] = None,
+) -> Callable[[F], F]:
     """
     Decorator for retry with exponential backoff.
     
+    Works on both plain and `async def` functions; coroutines back off
+    without blocking the event loop. With a `wakeup`, any backoff ends
+    early when `wakeup.wake()` is called (e.g. when a circuit opens).
+    
     Args:
         max_retries: Maximum retry attempts
         base_delay: Initial delay in seconds
-        max_delay: Maximum delay cap
+        max_delay: Maximum delay cap (applied after jitter)
         exponential_base: Multiplier for each retry
+        jitter: Fractional random spread applied to each delay (0 disables)
         retryable_exceptions: Exceptions that trigger retry
+        wakeup: Lets its owner cut backoff sleeps short
     """
-    def decorator(func):
-        @functools.wraps(func)
-        def wrapper(*args, **kwargs):
-            last_exception = None
+    def next_delay(attempt: int, e: BaseException) -> float:
+        # Handle rate limit with specific delay; jitter only ever lengthens
+        # retry_after so rate-limited callers don't all wake together
+        if isinstance(e, StripeRateLimitError):
+            delay = e.retry_after * (1 + _retry_rng.uniform(0, jitter))
+        else:
+            delay = base_delay * (exponential_base ** attempt)
+            delay *= 1 + _retry_rng.uniform(-jitter, jitter)
+        # Cap last, so max_delay holds for the jittered delay too
+        return min(delay, max_delay)
+    
+    def decorator(func: F) -> F:
+        func_name: str = func.__name__
+        log_warning = logger.warning
+        
+        if inspect.iscoroutinefunction(func):
+            sleep = wakeup.async_sleep if wakeup else asyncio.sleep
             
-            for attempt in range(max_retries + 1):
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                # Fast path: the first attempt runs without any retry setup
                 try:
-                    return func(*args, **kwargs)
-                    
+                    return await func(*args, **kwargs)
                 except retryable_exceptions as e:
-                    last_exception = e
-                    
-                    if attempt == max_retries:
-                        logger.error(
-                            "Max retries (%d) exceeded for %s: %s",
-                            max_retries, func.__name__, e
-                        )
-                        raise
-                    
-                    # Handle rate limit with specific delay
-                    if isinstance(e, StripeRateLimitError):
-                        delay = min(e.retry_after, max_delay)
-                    else:
-                        delay = min(base_delay * (exponential_base ** attempt), max_delay)
-                    
-                    logger.warning(
+                    error = e
+                
+                for attempt in range(max_retries):
+                    delay = next_delay(attempt, error)
+                    log_warning(
                         "Retry %d/%d for %s in %.1fs: %s",
-                        attempt + 1, max_retries, func.__name__, delay, e
+                        attempt + 1, max_retries, func_name, delay, error
                     )
-                    time.sleep(delay)
+                    await sleep(delay)
+                    
+                    try:
+                        return await func(*args, **kwargs)
+                    except retryable_exceptions as e:
+                        error = e
+                
+                logger.error(
+                    "Max retries (%d) exceeded for %s: %s",
+                    max_retries, func_name, error
+                )
+                raise error
+            return async_wrapper  # type: ignore[return-value]
+        
+        sleep = wakeup.sleep if wakeup else time.sleep
+        
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            # Fast path: the first attempt runs without any retry setup
+            try:
+                return func(*args, **kwargs)
+            except retryable_exceptions as e:
+                error = e
+            
+            for attempt in range(max_retries):
+                delay = next_delay(attempt, error)
+                log_warning(
+                    "Retry %d/%d for %s in %.1fs: %s",
+                    attempt + 1, max_retries, func_name, delay, error
+                )
+                sleep(delay)
+                
+                try:
+                    return func(*args, **kwargs)
+                except retryable_exceptions as e:
+                    error = e
             
-            raise last_exception
-        return wrapper
+            logger.error(
+                "Max retries (%d) exceeded for %s: %s",
+                max_retries, func_name, error
+            )
+            raise error
+        return wrapper  # type: ignore[return-value]
     return decorator
 
 
+# =============================================================================
+# Circuit Breaker
+# =============================================================================
+
+class CircuitState(Enum):
+    """Circuit breaker states."""
+    CLOSED = "CLOSED"        # Normal operation
+    OPEN = "OPEN"            # Failing fast, rejecting calls
+    HALF_OPEN = "HALF_OPEN"  # Probing whether the service recovered
+
+
+@dataclass(slots=True)
+class CircuitBreaker:
+    """
+    Circuit breaker for an external dependency.
+    
+    Once `failure_threshold` consecutive transient failures are seen the
+    circuit opens and calls fail immediately with
+    PaymentServiceUnavailableError instead of burning the retry budget.
+    After `open_timeout_s` it lets probe calls through (HALF_OPEN) and
+    closes again after `success_threshold` successful probes.
+    
+    Only `counted_exceptions` trip the breaker; card declines come back as
+    a normal Stripe response and never count against it.
+    
+    Example:
+        @retry_with_backoff(..., wakeup=stripe_breaker.wakeup)
+        @stripe_breaker.guard
+        async def call_stripe(...): ...
+    """
+    name: str
+    failure_threshold: int = 5
+    success_threshold: int = 2
+    open_timeout_s: float = 10.0
+    counted_exceptions: tuple[type[BaseException], ...] = (RetryableError,)
+    
+    # Internal state
+    _state: CircuitState = field(default=CircuitState.CLOSED, init=False)
+    _failures: int = field(default=0, init=False)
+    _successes: int = field(default=0, init=False)
+    _probes_in_flight: int = field(default=0, init=False)
+    # Bumped on every OPEN → HALF_OPEN, so stale probes can be told apart
+    _half_open_epoch: int = field(default=0, init=False)
+    _opened_at: float = field(default=0.0, init=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+    # Pass to retry_with_backoff(wakeup=...) so opening ends those backoffs
+    wakeup: RetryWakeup = field(default_factory=RetryWakeup, init=False, repr=False)
+    
+    @property
+    def state(self) -> CircuitState:
+        with self._lock:
+            return self._current_state(time.monotonic())
+    
+    def _current_state(self, now: float) -> CircuitState:
+        """Resolve the state at `now`; caller must hold the lock."""
+        if self._state == CircuitState.OPEN and now - self._opened_at >= self.open_timeout_s:
+            logger.info("[%s] Circuit OPEN → HALF_OPEN", self.name)
+            logger.info("METRIC | circuit.half_open | name=%s", self.name)
+            self._state = CircuitState.HALF_OPEN
+            self._half_open_epoch += 1
+            self._successes = 0
+            self._probes_in_flight = 0
+        return self._state
+    
+    def _before_call(self) -> Optional[int]:
+        """
+        Admit or reject a call, raising when the circuit is open.
+        
+        Returns the half-open episode a probe was admitted to, or None for
+        an ordinary call; the completion hooks take it back so only real
+        probes of the current episode count towards closing the circuit.
+        """
+        with self._lock:
+            now = time.monotonic()
+            state = self._current_state(now)
+            
+            if state == CircuitState.HALF_OPEN:
+                if self._probes_in_flight < self.success_threshold:
+                    self._probes_in_flight += 1
+                    return self._half_open_epoch
+                retry_after = self.open_timeout_s
+            elif state == CircuitState.OPEN:
+                retry_after = self.open_timeout_s - (now - self._opened_at)
+            else:
+                return None
+        
+        logger.warning("[%s] Circuit %s - failing fast", self.name, state.value)
+        raise PaymentServiceUnavailableError(retry_after=max(1, round(retry_after)))
+    
+    def _is_live_probe(self, probe: Optional[int]) -> bool:
+        """Whether `probe` belongs to the current half-open episode; caller holds the lock."""
+        return (
+            probe is not None
+            and probe == self._half_open_epoch
+            and self._state == CircuitState.HALF_OPEN
+        )
+    
+    def _on_success(self, probe: Optional[int]) -> None:
+        with self._lock:
+            if self._is_live_probe(probe):
+                self._probes_in_flight -= 1
+                self._successes += 1
+                if self._successes < self.success_threshold:
+                    return
+                logger.info("[%s] Circuit recovered → CLOSED", self.name)
+                self._state = CircuitState.CLOSED
+                self._failures = 0
+            elif probe is None and self._state == CircuitState.CLOSED:
+                self._failures = 0
+            # Otherwise the call was admitted before the circuit opened (or
+            # probed an earlier episode) and says nothing about recovery
+    
+    def _on_failure(self, error: BaseException, probe: Optional[int]) -> None:
+        """Count a failure; if it opens the circuit, fail this call fast too."""
+        with self._lock:
+            if self._is_live_probe(probe):
+                # Any failed probe sends the circuit straight back to OPEN
+                self._probes_in_flight -= 1
+                self._failures += 1
+                opened = True
+            elif probe is None and self._state == CircuitState.CLOSED:
+                self._failures += 1
+                opened = self._failures >= self.failure_threshold
+            else:
+                opened = False  # late result; the circuit already reacted
+            
+            if opened:
+                self._state = CircuitState.OPEN
+                self._opened_at = time.monotonic()
+                logger.error(
+                    "[%s] Circuit OPENED after %d failures: %s",
+                    self.name, self._failures, error
+                )
+                logger.info("METRIC | circuit.opened | name=%s", self.name)
+        
+        if opened:
+            # Callers backing off would only hit the open circuit later;
+            # wake them so they fail fast now
+            self.wakeup.wake()
+            raise PaymentServiceUnavailableError(
+                retry_after=max(1, round(self.open_timeout_s))
+            ) from error
+    
+    def _on_other_error(self, probe: Optional[int]) -> None:
+        """A non-counted error still ends a half-open probe."""
+        with self._lock:
+            if self._is_live_probe(probe):
+                self._probes_in_flight -= 1
+    
+    def guard(self, func: F) -> F:
+        """Decorator routing every call to `func` through the breaker."""
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_guarded(*args: Any, **kwargs: Any) -> Any:
+                probe = self._before_call()
+                try:
+                    result = await func(*args, **kwargs)
+                except self.counted_exceptions as e:
+                    self._on_failure(e, probe)
+                    raise
+                except BaseException:
+                    self._on_other_error(probe)
+                    raise
+                self._on_success(probe)
+                return result
+            return async_guarded  # type: ignore[return-value]
+        
+        @functools.wraps(func)
+        def guarded(*args: Any, **kwargs: Any) -> Any:
+            probe = self._before_call()
+            try:
+                result = func(*args, **kwargs)
+            except self.counted_exceptions as e:
+                self._on_failure(e, probe)
+                raise
+            except BaseException:
+                self._on_other_error(probe)
+                raise
+            self._on_success(probe)
+            return result
+        return guarded  # type: ignore[return-value]
+
+
+# Shared by every PaymentService so all requests see the same Stripe health
+stripe_breaker = CircuitBreaker(name="stripe")
+
+
 # =============================================================================
 # Data Models
 # =============================================================================
 
-class TransactionStatus(Enum):
+def parse_cents(value: Any) -> int:
+    """
+    Parse a wire amount ("99.99", 99.99, 100) into integer cents.
+    
+    Amounts are carried as int cents end-to-end (Stripe is cents-native)
+    and only formatted back to dollars at the response boundary.
+    
+    Raises:
+        ValidationError: Not a plain decimal number with at most 2 places
+    """
+    if type(value) is int:
+        return value * 100
+    
+    text = str(value).strip()
+    sign = -1 if text[:1] == "-" else 1
+    if text[:1] in ("-", "+"):
+        text = text[1:]
+    whole, _, frac = text.partition(".")
+    if (
+        len(frac) > 2
+        or not (whole or frac)
+        or (whole and not whole.isdecimal())
+        or (frac and not frac.isdecimal())
+    ):
+        raise ValidationError("Amount must be a number with at most 2 decimal places", field="amount")
+    return sign * (int(whole or "0") * 100 + int(frac.ljust(2, "0")))
+
+
+def format_cents(cents: int) -> str:
+    """Format integer cents as a dollar string, e.g. 9999 -> "99.99"."""
+    sign = "-" if cents < 0 else ""
+    dollars, rem = divmod(abs(cents), 100)
+    return f"{sign}{dollars}.{rem:02d}"
+
+
+# (epoch second, "YYYY-MM-DDTHH:MM:SS") for the most recent timestamp
+_iso_second_cache: tuple[int, str] = (-1, "")
+
+
+def _utc_now_iso() -> str:
+    """
+    Current UTC time as an ISO-8601 string with microseconds.
+    
+    The date/time prefix only changes once a second, so it is formatted
+    once and reused; each call just appends the microsecond fraction.
+    """
+    global _iso_second_cache
+    sec, micros = divmod(time.time_ns() // 1000, 1_000_000)
+    cached_sec, prefix = _iso_second_cache
+    if sec != cached_sec:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(sec))
+        _iso_second_cache = (sec, prefix)
+    return f"{prefix}.{micros:06d}"
+
+
+class TransactionStatus(str, Enum):
+    """Transaction lifecycle state; members are their wire strings."""
     PENDING = "pending"
     COMPLETED = "completed"
     FAILED = "failed"
     REFUNDED = "refunded"
 
 
-@dataclass
+@dataclass(slots=True)
 class User:
     id: int
     email: str
-    balance: Decimal
+    balance_cents: int
     default_card_id: Optional[str] = None
     
+    # Derived Stripe strings, built once per user rather than per charge
+    # (slots rule out cached_property, so they are filled in __post_init__)
+    stripe_customer_id: str = field(init=False, repr=False)
+    default_description: str = field(init=False, repr=False)
+    
+    def __post_init__(self) -> None:
+        self.stripe_customer_id = f"cus_{self.id}"
+        self.default_description = f"Payment for user {self.id}"
+    
     def has_valid_card(self) -> bool:
         return self.default_card_id is not None
 
 
-@dataclass
+@dataclass(slots=True)
 class Transaction:
     id: str
     user_id: int
-    amount: Decimal
+    amount_cents: int
     currency: str
     status: TransactionStatus
     stripe_charge_id: Optional[str] = None
     idempotency_key: str = ""
-    created_at: datetime = field(default_factory=datetime.utcnow)
+    created_at: str = field(default_factory=_utc_now_iso)  # ISO-8601 UTC
     error_message: Optional[str] = None
     
     def to_dict(self) -> dict:
         return {
             "id": self.id,
             "user_id": self.user_id,
-            "amount": str(self.amount),
+            "amount": format_cents(self.amount_cents),
             "currency": self.currency,
-            "status": self.status.value,
+            "status": self.status,
             "stripe_charge_id": self.stripe_charge_id,
-            "created_at": self.created_at.isoformat(),
+            "created_at": self.created_at,
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class PaymentRequest:
     """Validated payment request."""
     user_id: int
-    amount: Decimal
+    amount_cents: int
     currency: str = "usd"
     description: Optional[str] = None
     idempotency_key: Optional[str] = None
@@ -263,58 +666,249 @@ class PaymentRequest:
 # Mock Repositories (Replace with real DB implementations)
 # =============================================================================
 
+class ShardedDict:
+    """
+    Lock-striped dict for concurrent repositories.
+    
+    Keys are spread over `num_shards` dicts by hash. Reads are a single
+    dict probe and take no lock; writes lock only their own shard. With
+    `max_items` set, each shard evicts its oldest entry once full so
+    long-running processes don't grow without bound.
+    """
+    
+    def __init__(
+        self,
+        num_shards: int = 64,
+        max_items: Optional[int] = None,
+        items: Optional[dict] = None,
+    ):
+        if num_shards & (num_shards - 1):
+            raise ValueError("num_shards must be a power of two")
+        self._mask = num_shards - 1
+        self._shards: list[OrderedDict] = [OrderedDict() for _ in range(num_shards)]
+        self._locks = [threading.Lock() for _ in range(num_shards)]
+        self._shard_cap = None if max_items is None else max(1, max_items // num_shards)
+        for key, value in (items or {}).items():
+            self.set(key, value)
+    
+    def get(self, key: Any, default: Any = None) -> Any:
+        return self._shards[hash(key) & self._mask].get(key, default)
+    
+    def set(self, key: Any, value: Any) -> None:
+        index = hash(key) & self._mask
+        shard = self._shards[index]
+        with self._locks[index]:
+            shard[key] = value
+            shard.move_to_end(key)
+            if self._shard_cap is not None and len(shard) > self._shard_cap:
+                shard.popitem(last=False)
+    
+    def __contains__(self, key: Any) -> bool:
+        return key in self._shards[hash(key) & self._mask]
+    
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self._shards)
+
+
 class UserRepository:
     """User data access."""
     
-    _users = {
-        1: User(id=1, email="alice@example.com", balance=Decimal("1000.00"), default_card_id="card_abc123"),
-        2: User(id=2, email="bob@example.com", balance=Decimal("500.00"), default_card_id="card_def456"),
-        3: User(id=3, email="charlie@example.com", balance=Decimal("250.00"), default_card_id=None),  # No card
-    }
+    _users = ShardedDict(items={
+        1: User(id=1, email="alice@example.com", balance_cents=100_000, default_card_id="card_abc123"),
+        2: User(id=2, email="bob@example.com", balance_cents=50_000, default_card_id="card_def456"),
+        3: User(id=3, email="charlie@example.com", balance_cents=25_000, default_card_id=None),  # No card
+    })
     
     def get_by_id(self, user_id: int) -> Optional[User]:
         return self._users.get(user_id)
     
-    def update_balance(self, user_id: int, new_balance: Decimal) -> None:
-        if user_id in self._users:
-            self._users[user_id].balance = new_balance
+    def update_balance(self, user_id: int, new_balance_cents: int) -> None:
+        user = self._users.get(user_id)
+        if user is not None:
+            user.balance_cents = new_balance_cents
 
 
 class TransactionRepository:
     """Transaction data access."""
     
-    _transactions: dict[str, Transaction] = {}
-    _idempotency_index: dict[str, str] = {}  # idempotency_key -> transaction_id
+    MAX_TRANSACTIONS = 1_000_000
+    
+    _transactions = ShardedDict(max_items=MAX_TRANSACTIONS)
+    # idempotency_key -> Transaction, so a duplicate check is one lookup
+    _idempotency_index = ShardedDict(max_items=MAX_TRANSACTIONS)
     
     def create(self, transaction: Transaction) -> Transaction:
-        self._transactions[transaction.id] = transaction
+        self._transactions.set(transaction.id, transaction)
         if transaction.idempotency_key:
-            self._idempotency_index[transaction.idempotency_key] = transaction.id
+            self._idempotency_index.set(transaction.idempotency_key, transaction)
         return transaction
     
     def get_by_id(self, transaction_id: str) -> Optional[Transaction]:
         return self._transactions.get(transaction_id)
     
     def get_by_idempotency_key(self, key: str) -> Optional[Transaction]:
-        tx_id = self._idempotency_index.get(key)
-        return self._transactions.get(tx_id) if tx_id else None
+        return self._idempotency_index.get(key)
     
     def update(self, transaction: Transaction) -> None:
-        self._transactions[transaction.id] = transaction
+        self._transactions.set(transaction.id, transaction)
+        if transaction.idempotency_key:
+            self._idempotency_index.set(transaction.idempotency_key, transaction)
+
+
+class UnitOfWork:
+    """
+    Groups the post-charge repository writes so they commit together.
+    
+    Writes are staged inside the `with` block and applied in one go on a
+    clean exit. Staging validates up front (e.g. that the user exists), so
+    a block that raises applies nothing; if a write fails while applying,
+    the writes already made are undone in reverse order before the error
+    propagates. With a real DB this is `with session.begin():` around one
+    INSERT/UPDATE batch, so the window between "Stripe charged" and "we
+    recorded it" is a single round trip instead of one per write.
+    """
+    
+    _commit_lock = threading.Lock()
+    
+    def __init__(self, transaction_repo: "TransactionRepository", user_repo: UserRepository):
+        self.transaction_repo = transaction_repo
+        self.user_repo = user_repo
+        # Each staged write registers its undo before writing anything
+        self._pending: list[Callable[[list[Callable[[], None]]], None]] = []
+        self.balance_changes: list[tuple[int, int, int]] = []  # (user_id, old, new)
+    
+    def complete_transaction(self, transaction: Transaction, stripe_charge_id: str) -> None:
+        def apply(undo_log: list[Callable[[], None]]) -> None:
+            previous = (transaction.stripe_charge_id, transaction.status)
+            
+            def undo() -> None:
+                transaction.stripe_charge_id, transaction.status = previous
+                self.transaction_repo.update(transaction)
+            undo_log.append(undo)
+            
+            transaction.stripe_charge_id = stripe_charge_id
+            transaction.status = TransactionStatus.COMPLETED
+            self.transaction_repo.update(transaction)
+        self._pending.append(apply)
+    
+    def credit_balance(self, user_id: int, amount_cents: int) -> None:
+        if self.user_repo.get_by_id(user_id) is None:
+            raise ValidationError("User not found", field="user_id")
+        
+        def apply(undo_log: list[Callable[[], None]]) -> None:
+            # Read the balance at commit time so concurrent credits aren't lost
+            user = self.user_repo.get_by_id(user_id)
+            if user is None:
+                raise ValidationError("User not found", field="user_id")
+            old_balance_cents = user.balance_cents
+            new_balance_cents = old_balance_cents + amount_cents
+            undo_log.append(lambda: self.user_repo.update_balance(user_id, old_balance_cents))
+            self.user_repo.update_balance(user_id, new_balance_cents)
+            self.balance_changes.append((user_id, old_balance_cents, new_balance_cents))
+        self._pending.append(apply)
+    
+    def __enter__(self) -> "UnitOfWork":
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        pending, self._pending = self._pending, []
+        if exc_type is not None:
+            return False
+        undo_log: list[Callable[[], None]] = []
+        with self._commit_lock:
+            try:
+                for apply in pending:
+                    apply(undo_log)
+            except BaseException:
+                for undo in reversed(undo_log):
+                    try:
+                        undo()
+                    except Exception:
+                        # Keep rolling back; reconciliation sorts out the rest
+                        logger.exception("UnitOfWork rollback step failed")
+                self.balance_changes.clear()
+                raise
+        return False
 
 
 class ReconciliationQueue:
-    """Queue for partial failure reconciliation."""
+    """
+    Queue for partial failure reconciliation.
+    
+    `enqueue` is a non-blocking put onto a bounded in-memory queue. A daemon
+    worker drains it in batches (up to BATCH_SIZE items or BATCH_TIMEOUT_S)
+    and writes each batch to the durable store in one go, so a burst of
+    partial failures doesn't turn into a burst of synchronous writes on the
+    request path.
+    """
     
-    _queue: list[dict] = []
+    MAX_PENDING = 10_000
+    BATCH_SIZE = 100
+    BATCH_TIMEOUT_S = 0.1
+    
+    _queue: queue.Queue = queue.Queue(maxsize=MAX_PENDING)
+    _records: list[dict] = []  # Durable store stand-in (Kafka/SQS/DB in production)
+    _records_lock = threading.Lock()
+    _worker: Optional[threading.Thread] = None
+    _worker_lock = threading.Lock()
     
     def enqueue(self, item: dict) -> None:
-        item["queued_at"] = datetime.utcnow().isoformat()
-        self._queue.append(item)
-        logger.warning("RECONCILIATION QUEUED: %s", item)
+        item["queued_at"] = _utc_now_iso()
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            # Never drop a reconciliation item; write it through instead
+            logger.critical("RECONCILIATION QUEUE FULL - writing through: %s", item)
+            self._write_batch([item])
     
     def get_pending(self) -> list[dict]:
-        return self._queue.copy()
+        self.flush()
+        with self._records_lock:
+            return self._records.copy()
+    
+    def flush(self) -> None:
+        """Block until every enqueued item has been written."""
+        self._queue.join()
+    
+    @classmethod
+    def _ensure_worker(cls) -> None:
+        if cls._worker is not None:
+            return
+        with cls._worker_lock:
+            if cls._worker is None:
+                cls._worker = threading.Thread(
+                    target=cls._drain, name="reconciliation-drain", daemon=True
+                )
+                cls._worker.start()
+    
+    @classmethod
+    def _drain(cls) -> None:
+        while True:
+            batch = [cls._queue.get()]
+            deadline = time.monotonic() + cls.BATCH_TIMEOUT_S
+            while len(batch) < cls.BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(cls._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            
+            try:
+                cls._write_batch(batch)
+            except Exception:
+                logger.exception("Failed to write reconciliation batch of %d", len(batch))
+            finally:
+                for _ in batch:
+                    cls._queue.task_done()
+    
+    @classmethod
+    def _write_batch(cls, batch: list[dict]) -> None:
+        with cls._records_lock:
+            cls._records.extend(batch)
+        logger.warning("RECONCILIATION QUEUED: %d item(s) %s", len(batch), batch)
 
 
 # =============================================================================
@@ -330,7 +924,15 @@ class MockStripeClient:
     # Simulate various failure scenarios
     _failure_counter = 0
     
-    def create_charge(
+    # Cumulative roll thresholds and the outcome each band maps to
+    _THRESHOLDS = (0.10, 0.15, 0.25, 1.0)
+    _OUTCOMES = ("timeout", "rate_limit", "decline", "success")
+    
+    def __init__(self):
+        # Per-client RNG avoids contention on the module-level Random
+        self._rng = random.Random()
+    
+    async def create_charge(
         self,
         amount: int,  # Amount in cents
         currency: str,
@@ -348,23 +950,24 @@ class MockStripeClient:
         - Card declines (10% chance)
         - Success (75% chance)
         """
-        import random
-        
         MockStripeClient._failure_counter += 1
-        roll = random.random()
+        outcome = self._OUTCOMES[bisect.bisect_right(self._THRESHOLDS, self._rng.random())]
+        
+        # Stand-in for the network round trip; yields to the event loop
+        await asyncio.sleep(0)
         
         # Simulate timeout
-        if roll < 0.10:
+        if outcome == "timeout":
             logger.debug("STRIPE: Simulating timeout")
             raise StripeTimeoutError("Connection to Stripe timed out")
         
         # Simulate rate limit
-        if roll < 0.15:
+        if outcome == "rate_limit":
             logger.debug("STRIPE: Simulating rate limit")
             raise StripeRateLimitError(retry_after=30)
         
         # Simulate card decline
-        if roll < 0.25:
+        if outcome == "decline":
             logger.debug("STRIPE: Simulating card decline")
             return {
                 "id": None,
@@ -392,6 +995,11 @@ class MockStripeClient:
 # Payment Service
 # =============================================================================
 
+# Validation limits, built once instead of per request
+_MAX_AMOUNT_CENTS = 1_000_000  # $10,000
+_SUPPORTED_CURRENCIES: frozenset[str] = frozenset({"usd", "eur", "gbp"})
+
+
 class PaymentService:
     """
     Payment processing service.
@@ -399,9 +1007,9 @@ class PaymentService:
     Handles the full payment flow:
     1. Validate request
     2. Check for duplicates (idempotency)
-    3. Call Stripe with retry
-    4. Create transaction record
-    5. Update user balance
+    3. Create pending transaction record
+    4. Call Stripe with retry
+    5. Complete transaction + update balance in one unit of work
     6. Handle partial failures
     """
     
@@ -417,7 +1025,7 @@ class PaymentService:
         self.stripe = stripe_client
         self.reconciliation_queue = reconciliation_queue
     
-    def process_payment(self, request: PaymentRequest) -> dict:
+    async def process_payment(self, request: PaymentRequest) -> dict:
         """
         Process a payment request.
         
@@ -437,8 +1045,8 @@ class PaymentService:
             PartialFailureError: Charge succeeded but DB failed
         """
         logger.info(
-            "Processing payment | user_id=%d amount=%.2f currency=%s",
-            request.user_id, request.amount, request.currency
+            "Processing payment | user_id=%d amount_cents=%d currency=%s",
+            request.user_id, request.amount_cents, request.currency
         )
         
         # ─────────────────────────────────────────────────────────────────────
@@ -449,9 +1057,14 @@ class PaymentService:
         # ─────────────────────────────────────────────────────────────────────
         # Step 2: Check for duplicate (idempotency)
         # ─────────────────────────────────────────────────────────────────────
-        idempotency_key = request.idempotency_key or self._generate_idempotency_key(request)
+        # Only caller-supplied keys are tracked; requests without one are
+        # never treated as duplicates of each other.
+        idempotency_key = request.idempotency_key
         
-        existing = self.transaction_repo.get_by_idempotency_key(idempotency_key)
+        existing = (
+            self.transaction_repo.get_by_idempotency_key(idempotency_key)
+            if idempotency_key else None
+        )
         if existing:
             if existing.status == TransactionStatus.COMPLETED:
                 logger.info("Duplicate payment detected | transaction_id=%s", existing.id)
@@ -479,10 +1092,10 @@ class PaymentService:
         transaction = Transaction(
             id=f"txn_{uuid.uuid4().hex[:16]}",
             user_id=user.id,
-            amount=request.amount,
+            amount_cents=request.amount_cents,
             currency=request.currency,
             status=TransactionStatus.PENDING,
-            idempotency_key=idempotency_key,
+            idempotency_key=idempotency_key or "",
         )
         self.transaction_repo.create(transaction)
         
@@ -492,12 +1105,13 @@ class PaymentService:
         # Step 5: Call Stripe with retry
         # ─────────────────────────────────────────────────────────────────────
         try:
-            stripe_result = self._call_stripe_with_retry(
+            stripe_result = await self._call_stripe_with_retry(
                 user=user,
-                amount=request.amount,
+                amount_cents=request.amount_cents,
                 currency=request.currency,
                 description=request.description,
-                idempotency_key=idempotency_key,
+                # Stable across our retries, so Stripe never double-charges
+                idempotency_key=idempotency_key or transaction.id,
             )
         except (StripeTimeoutError, StripeRateLimitError) as e:
             # All retries exhausted
@@ -507,6 +1121,18 @@ class PaymentService:
             
             logger.error("Stripe unavailable after retries | transaction_id=%s", transaction.id)
             raise PaymentServiceUnavailableError(retry_after=60)
+        except PaymentServiceUnavailableError as e:
+            # Circuit open: either Stripe was never called, or this call's
+            # failure is the one that tripped it (then chained as __cause__)
+            transaction.status = TransactionStatus.FAILED
+            transaction.error_message = e.message
+            self.transaction_repo.update(transaction)
+            
+            logger.error(
+                "Stripe circuit open | transaction_id=%s tripped_by=%s",
+                transaction.id, e.__cause__ or "earlier failures"
+            )
+            raise
         
         # ─────────────────────────────────────────────────────────────────────
         # Step 6: Handle Stripe response
@@ -526,16 +1152,18 @@ class PaymentService:
             )
         
         # ─────────────────────────────────────────────────────────────────────
-        # Step 7: Update transaction with Stripe charge ID
+        # Step 7: Record the charge and credit the balance in one unit of work
         # ─────────────────────────────────────────────────────────────────────
         stripe_charge_id = stripe_result["id"]
-        transaction.stripe_charge_id = stripe_charge_id
-        transaction.status = TransactionStatus.COMPLETED
         
         try:
-            self.transaction_repo.update(transaction)
+            with UnitOfWork(self.transaction_repo, self.user_repo) as uow:
+                uow.complete_transaction(transaction, stripe_charge_id)
+                uow.credit_balance(user.id, request.amount_cents)
         except Exception as e:
-            # PARTIAL FAILURE: Charge succeeded but DB write failed
+            # PARTIAL FAILURE: Charge succeeded but the unit of work was
+            # rolled back, so the transaction is still PENDING and no balance
+            # was credited; reconciliation completes both
             logger.critical(
                 "PARTIAL FAILURE | stripe_charge_id=%s transaction_id=%s error=%s",
                 stripe_charge_id, transaction.id, e
@@ -550,36 +1178,18 @@ class PaymentService:
                 failure_reason="Transaction record update failed",
             )
         
-        # ─────────────────────────────────────────────────────────────────────
-        # Step 8: Update user balance
-        # ─────────────────────────────────────────────────────────────────────
-        try:
-            new_balance = user.balance + request.amount
-            self.user_repo.update_balance(user.id, new_balance)
-            
+        for user_id, old_balance_cents, new_balance_cents in uow.balance_changes:
             logger.info(
-                "Balance updated | user_id=%d old=%.2f new=%.2f",
-                user.id, user.balance, new_balance
-            )
-        except Exception as e:
-            # Balance update failed - queue for reconciliation
-            logger.critical(
-                "Balance update failed | user_id=%d transaction_id=%s error=%s",
-                user.id, transaction.id, e
-            )
-            self._handle_partial_failure(
-                stripe_charge_id=stripe_charge_id,
-                transaction=transaction,
-                error=e,
+                "Balance updated | user_id=%d old_cents=%d new_cents=%d",
+                user_id, old_balance_cents, new_balance_cents
             )
-            # Don't raise - payment succeeded, just needs reconciliation
         
         # ─────────────────────────────────────────────────────────────────────
-        # Step 9: Return success response
+        # Step 8: Return success response
         # ─────────────────────────────────────────────────────────────────────
         logger.info(
-            "Payment completed | transaction_id=%s stripe_charge_id=%s amount=%.2f",
-            transaction.id, stripe_charge_id, request.amount
+            "Payment completed | transaction_id=%s stripe_charge_id=%s amount_cents=%d",
+            transaction.id, stripe_charge_id, request.amount_cents
         )
         
         return {
@@ -589,43 +1199,40 @@ class PaymentService:
     
     def _validate_request(self, request: PaymentRequest) -> None:
         """Validate payment request fields."""
-        if request.amount <= 0:
+        if request.amount_cents <= 0:
             raise ValidationError("Amount must be greater than 0", field="amount")
         
-        if request.amount > Decimal("10000.00"):
+        if request.amount_cents > _MAX_AMOUNT_CENTS:
             raise ValidationError("Amount exceeds maximum ($10,000)", field="amount")
         
-        if request.currency not in ("usd", "eur", "gbp"):
+        if request.currency not in _SUPPORTED_CURRENCIES:
             raise ValidationError("Unsupported currency", field="currency")
     
-    def _generate_idempotency_key(self, request: PaymentRequest) -> str:
-        """Generate idempotency key from request data."""
-        data = f"{request.user_id}:{request.amount}:{request.currency}:{datetime.utcnow().date()}"
-        return hashlib.sha256(data.encode()).hexdigest()[:32]
-    
     @retry_with_backoff(
         max_retries=3,
         base_delay=1.0,
         max_delay=30.0,
         retryable_exceptions=(StripeTimeoutError, StripeRateLimitError),
+        wakeup=stripe_breaker.wakeup,
     )
-    def _call_stripe_with_retry(
+    @stripe_breaker.guard
+    async def _call_stripe_with_retry(
         self,
         user: User,
-        amount: Decimal,
+        amount_cents: int,
         currency: str,
         description: Optional[str],
         idempotency_key: str,
     ) -> dict:
         """Call Stripe API with automatic retry on transient failures."""
-        logger.debug("Calling Stripe API | amount=%.2f currency=%s", amount, currency)
+        logger.debug("Calling Stripe API | amount_cents=%d currency=%s", amount_cents, currency)
         
-        return self.stripe.create_charge(
-            amount=int(amount * 100),  # Convert to cents
+        return await self.stripe.create_charge(
+            amount=amount_cents,
             currency=currency,
-            customer=f"cus_{user.id}",
+            customer=user.stripe_customer_id,
             source=user.default_card_id,
-            description=description or f"Payment for user {user.id}",
+            description=description or user.default_description,
             idempotency_key=idempotency_key,
         )
     
@@ -641,7 +1248,7 @@ class PaymentService:
             "stripe_charge_id": stripe_charge_id,
             "transaction_id": transaction.id,
             "user_id": transaction.user_id,
-            "amount": str(transaction.amount),
+            "amount": format_cents(transaction.amount_cents),
             "error": str(error),
             "action_required": "verify_and_complete_transaction",
         })
@@ -651,61 +1258,80 @@ class PaymentService:
 # API Endpoint Handler (Example)
 # =============================================================================
 
-def handle_post_payments(request_body: dict) -> tuple[dict, int]:
+@functools.cache
+def get_service() -> PaymentService:
     """
-    POST /payments endpoint handler.
+    Shared PaymentService instance, built on first use.
     
-    Args:
-        request_body: JSON request body
-        
-    Returns:
-        Tuple of (response_dict, status_code)
+    In a web framework, register this as the dependency provider
+    (e.g. FastAPI's `Depends(get_service)`) so requests reuse it.
     """
-    # Initialize service (in production, use dependency injection)
-    service = PaymentService(
+    return PaymentService(
         user_repo=UserRepository(),
         transaction_repo=TransactionRepository(),
         stripe_client=MockStripeClient(),
         reconciliation_queue=ReconciliationQueue(),
     )
+
+
+# Fully static, so serialized once
+_INTERNAL_ERROR_BODY = dumps_json({
+    "error": {
+        "code": "INTERNAL_ERROR",
+        "message": "An unexpected error occurred",
+    }
+})
+
+
+async def handle_post_payments(request_body: dict) -> tuple[bytes, int]:
+    """
+    POST /payments endpoint handler.
+    
+    Args:
+        request_body: JSON request body
+        
+    Returns:
+        Tuple of (JSON response body, status_code); serve the body as-is
+        with Content-Type: application/json
+    """
+    service = get_service()
     
     try:
         # Parse request
         payment_request = PaymentRequest(
             user_id=request_body.get("user_id"),
-            amount=Decimal(str(request_body.get("amount", 0))),
+            amount_cents=parse_cents(request_body.get("amount", 0)),
             currency=request_body.get("currency", "usd"),
             description=request_body.get("description"),
             idempotency_key=request_body.get("idempotency_key"),
         )
         
         # Process payment
-        result = service.process_payment(payment_request)
-        return result, 200
+        result = await service.process_payment(payment_request)
+        return dumps_json(result), 200
         
     except BaseAPIError as e:
         logger.warning("API Error: %s", e.message)
-        return e.to_response(), e.status_code
+        return e.to_response_bytes(), e.status_code
         
     except Exception as e:
         logger.exception("Unexpected error processing payment")
-        return {
-            "error": {
-                "code": "INTERNAL_ERROR",
-                "message": "An unexpected error occurred",
-            }
-        }, 500
+        return _INTERNAL_ERROR_BODY, 500
 
 
 # =============================================================================
 # Demo
 # =============================================================================
 
-def demo():
+def _write_lines(lines: list[str]) -> None:
+    """Write a block of demo output in one buffered call."""
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
+
+
+async def demo():
     """Demonstrate the payment service."""
-    print("\n" + "=" * 70)
-    print("💳 PAYMENT SERVICE DEMO")
-    print("=" * 70)
+    _write_lines(["", "=" * 70, "💳 PAYMENT SERVICE DEMO", "=" * 70])
     
     # Test cases
     test_cases = [
@@ -730,25 +1356,23 @@ def demo():
     ]
     
     for i, test in enumerate(test_cases, 1):
-        print(f"\n{'─' * 70}")
-        print(f"Test {i}: {test}")
-        print(f"{'─' * 70}")
+        # Header first: the handler's log lines should land under it
+        _write_lines(["", "─" * 70, f"Test {i}: {test}", "─" * 70])
         
-        response, status_code = handle_post_payments(test)
+        body, status_code = await handle_post_payments(test)
+        response = json.loads(body)
         
-        print(f"\nStatus: {status_code}")
+        lines = ["", f"Status: {status_code}"]
         
         if "error" in response:
-            print(f"Error: {response['error']['code']} - {response['error']['message']}")
+            lines.append(f"Error: {response['error']['code']} - {response['error']['message']}")
         else:
-            print(f"Success: Transaction {response.get('transaction', {}).get('id')}")
+            lines.append(f"Success: Transaction {response.get('transaction', {}).get('id')}")
         
-        time.sleep(0.5)
+        _write_lines(lines)
     
-    print("\n" + "=" * 70)
-    print("Demo complete!")
-    print("=" * 70 + "\n")
+    _write_lines(["", "=" * 70, "Demo complete!", "=" * 70, ""])
 
 
 if __name__ == "__main__":
-    demo()
+    asyncio.run(demo())
@@ -10,13 +10,19 @@ Demonstrates:
 Based on Chapter 2 (Lightning Paths) patterns for handling async flows reliably.
 """
 
+import math
 import time
+import heapq
+import types
 import random
+import operator
 import logging
 import functools
+import threading
+from collections import deque
 from typing import TypeVar, Callable, Any, Optional
-from dataclasses import dataclass, field
-from datetime import datetime
+from dataclasses import dataclass, field, fields
+from datetime import datetime, timezone
 from enum import Enum
 from contextlib import contextmanager
 
@@ -67,12 +73,37 @@ class ServiceUnavailableError(TransientError):
 # Metrics Collection
 # =============================================================================
 
-@dataclass
+_latency_of = operator.itemgetter(2)
+
+
+def _utc_isoformat(ts: float) -> str:
+    """Naive-UTC ISO string for an epoch timestamp (utcfromtimestamp without the 3.12 deprecation)."""
+    return datetime.fromtimestamp(ts, timezone.utc).replace(tzinfo=None).isoformat()
+
+
+# Calls waiting for the aggregator; past this the oldest samples are dropped
+_PENDING_CAPACITY = 65_536
+_DRAIN_INTERVAL_S = 0.05
+# The aggregator exits after this long with nothing to do (restarted on demand)
+_IDLE_EXIT_S = 1.0
+
+
+@dataclass(slots=True)
 class Metrics:
     """
     Simple metrics collector for monitoring API health.
     
     In production, replace with Prometheus, StatsD, or your metrics system.
+    
+    `record_call` only appends a sample to a bounded deque; a daemon thread
+    folds pending samples into the counters every _DRAIN_INTERVAL_S, so the
+    request thread never waits on aggregation. The counter attributes lag
+    by up to one interval - summary(), history() and p95_latency_ms()
+    flush first. Aggregation is serialized by a lock; reads are lock-free,
+    so a reader may see e.g. total_calls updated before successful_calls.
+    
+    The thread exits after _IDLE_EXIT_S without samples, so an unused
+    instance (or copy) doesn't keep it alive; close() stops it for good.
     """
     total_calls: int = 0
     successful_calls: int = 0
@@ -80,33 +111,92 @@ class Metrics:
     retries: int = 0
     circuit_breaks: int = 0
     total_latency_ms: float = 0.0
-    _call_history: list = field(default_factory=list)
+    # Rolling window of (timestamp, success, latency_ms, retries) tuples
+    _call_history: deque = field(default_factory=lambda: deque(maxlen=1000))
+    _pending: deque = field(
+        default_factory=lambda: deque(maxlen=_PENDING_CAPACITY), init=False, repr=False
+    )
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+    _worker: Optional[threading.Thread] = field(default=None, init=False, repr=False)
+    _closed: threading.Event = field(default_factory=threading.Event, init=False, repr=False)
+    
+    def __getstate__(self) -> dict[str, Any]:
+        # Locks/threads can't be pickled/deep-copied; restore makes fresh ones
+        self.flush()
+        return {
+            f.name: getattr(self, f.name)
+            for f in fields(self)
+            if f.name not in ("_lock", "_worker", "_closed")
+        }
+    
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        for name, value in state.items():
+            setattr(self, name, value)
+        self._lock = threading.Lock()
+        self._worker = None
+        self._closed = threading.Event()
     
     def record_call(self, success: bool, latency_ms: float, retries: int = 0) -> None:
         """Record a completed API call."""
-        self.total_calls += 1
-        self.total_latency_ms += latency_ms
-        self.retries += retries
-        
-        if success:
-            self.successful_calls += 1
-        else:
-            self.failed_calls += 1
-        
-        self._call_history.append({
-            "timestamp": datetime.utcnow().isoformat(),
-            "success": success,
-            "latency_ms": latency_ms,
-            "retries": retries,
-        })
-        
-        # Keep only last 1000 calls
-        if len(self._call_history) > 1000:
-            self._call_history = self._call_history[-1000:]
+        if self._worker is None:
+            self._start_worker()
+        # deque.append is atomic under the GIL - no lock on the request path
+        self._pending.append((time.time(), success, latency_ms, retries))
     
     def record_circuit_break(self) -> None:
         """Record when circuit breaker opens."""
-        self.circuit_breaks += 1
+        with self._lock:
+            self.circuit_breaks += 1
+    
+    def flush(self) -> None:
+        """Fold all pending samples into the counters and history."""
+        pending = self._pending
+        with self._lock:
+            for _ in range(len(pending)):
+                sample = pending.popleft()
+                _, success, latency_ms, retries = sample
+                self.total_calls += 1
+                self.total_latency_ms += latency_ms
+                self.retries += retries
+                
+                if success:
+                    self.successful_calls += 1
+                else:
+                    self.failed_calls += 1
+                
+                # Bounded deque drops the oldest entry itself - no slice copy
+                self._call_history.append(sample)
+    
+    def close(self) -> None:
+        """Stop the aggregator thread; later samples are folded in on read."""
+        self._closed.set()
+        worker = self._worker
+        if worker is not None:
+            worker.join()
+        self.flush()
+    
+    def _start_worker(self) -> None:
+        with self._lock:
+            if self._worker is None and not self._closed.is_set():
+                self._worker = threading.Thread(
+                    target=self._drain, name="metrics-drain", daemon=True
+                )
+                self._worker.start()
+    
+    def _drain(self) -> None:
+        idle_ticks = 0
+        # Waiting on the event (not sleeping) lets close() end the loop at once
+        while not self._closed.wait(_DRAIN_INTERVAL_S):
+            if self._pending:
+                self.flush()
+                idle_ticks = 0
+                continue
+            idle_ticks += 1
+            if idle_ticks * _DRAIN_INTERVAL_S >= _IDLE_EXIT_S:
+                with self._lock:
+                    # Drop our reference so the next record_call restarts us
+                    self._worker = None
+                return
     
     @property
     def success_rate(self) -> float:
@@ -122,8 +212,33 @@ class Metrics:
             return 0.0
         return self.total_latency_ms / self.total_calls
     
+    def p95_latency_ms(self) -> float:
+        """95th-percentile latency (nearest rank) over the recent call window."""
+        self.flush()
+        latencies = list(map(_latency_of, list(self._call_history)))
+        if not latencies:
+            return 0.0
+        # Only the top 5% is needed - a bounded heap beats a full sort
+        rank = len(latencies) - math.ceil(0.95 * len(latencies)) + 1
+        return heapq.nlargest(rank, latencies)[-1]
+    
+    def history(self) -> list[dict[str, Any]]:
+        """Get the recent call window, formatting timestamps on demand."""
+        self.flush()
+        # list(deque) copies in one C call, so appends can't interleave
+        return [
+            {
+                "timestamp": _utc_isoformat(ts),
+                "success": success,
+                "latency_ms": latency_ms,
+                "retries": retries,
+            }
+            for ts, success, latency_ms, retries in list(self._call_history)
+        ]
+    
     def summary(self) -> dict[str, Any]:
         """Get metrics summary."""
+        self.flush()
         return {
             "total_calls": self.total_calls,
             "successful_calls": self.successful_calls,
@@ -150,7 +265,14 @@ class CircuitState(Enum):
     HALF_OPEN = "HALF_OPEN"  # Testing if service recovered
 
 
-@dataclass
+# Module-level aliases: a global load + `is` check on the hot path instead
+# of an attribute lookup on the Enum class and an __eq__ call
+_CLOSED = CircuitState.CLOSED
+_OPEN = CircuitState.OPEN
+_HALF_OPEN = CircuitState.HALF_OPEN
+
+
+@dataclass(slots=True)
 class CircuitBreaker:
     """
     Circuit breaker pattern implementation.
@@ -167,6 +289,12 @@ class CircuitBreaker:
         failure_threshold: Number of failures before opening circuit
         recovery_timeout: Seconds to wait before testing recovery
         half_open_max_calls: Max calls allowed in half-open state
+        probe_fn: Zero-arg health check used when async_half_open is set
+        async_half_open: Once the recovery timeout passes, run probe_fn on a
+            background thread instead of letting caller requests act as the
+            test calls. The circuit stays OPEN (callers fail fast) until the
+            probe succeeds, so no caller waits on a still-sick backend.
+            Setting it without a probe_fn raises ValueError.
         
     Example:
         >>> breaker = CircuitBreaker(failure_threshold=5, recovery_timeout=30)
@@ -175,28 +303,88 @@ class CircuitBreaker:
     failure_threshold: int = 5
     recovery_timeout: float = 60.0
     half_open_max_calls: int = 3
+    probe_fn: Optional[Callable[[], Any]] = None
+    async_half_open: bool = False
     
     # Internal state
     _failures: int = field(default=0, init=False)
     _state: CircuitState = field(default=CircuitState.CLOSED, init=False)
-    _last_failure_time: Optional[float] = field(default=None, init=False)
+    _last_failure_time: Optional[float] = field(default=None, init=False)  # time.monotonic()
     _half_open_calls: int = field(default=0, init=False)
+    _probing: bool = field(default=False, init=False, repr=False)
+    # Guards the OPEN -> HALF_OPEN transition and test-call admission
+    _half_open_lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False, compare=False
+    )
+    # Swapped on state transitions: the CLOSED path skips the state machine
+    _dispatch: Callable[..., Any] = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self) -> None:
+        if self.async_half_open and self.probe_fn is None:
+            raise ValueError("async_half_open requires a probe_fn")
+        self._dispatch = self._dispatch_closed
+    
+    def __getstate__(self) -> dict[str, Any]:
+        # Locks and bound methods don't copy; restore rebuilds them
+        return {
+            f.name: getattr(self, f.name)
+            for f in fields(self)
+            if f.name not in ("_half_open_lock", "_dispatch", "_probing")
+        }
+    
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        for name, value in state.items():
+            setattr(self, name, value)
+        self._half_open_lock = threading.Lock()
+        self._probing = False  # the original's probe thread isn't ours
+        self._dispatch = (
+            self._dispatch_closed if self._state is _CLOSED else self._dispatch_guarded
+        )
     
     @property
     def state(self) -> CircuitState:
         """Get current circuit state, checking for recovery."""
-        if self._state == CircuitState.OPEN:
-            if self._last_failure_time is not None:
-                elapsed = time.time() - self._last_failure_time
-                if elapsed >= self.recovery_timeout:
-                    logger.info(
-                        "Circuit transitioning to HALF_OPEN after %.1fs recovery timeout",
-                        elapsed
-                    )
-                    self._state = CircuitState.HALF_OPEN
-                    self._half_open_calls = 0
+        state = self._state
+        if state is not _OPEN:
+            return state
+        if self._last_failure_time is not None:
+            elapsed = time.monotonic() - self._last_failure_time
+            if elapsed >= self.recovery_timeout:
+                if self.async_half_open:
+                    self._start_probe()
+                    return self._state
+                with self._half_open_lock:
+                    # Re-check so only one thread resets the test-call count
+                    if self._state is _OPEN:
+                        logger.info(
+                            "Circuit transitioning to HALF_OPEN after %.1fs recovery timeout",
+                            elapsed
+                        )
+                        self._state = _HALF_OPEN
+                        self._half_open_calls = 0
         return self._state
     
+    def _start_probe(self) -> None:
+        """Launch one background health check if none is running."""
+        with self._half_open_lock:
+            if self._probing or self._state is not _OPEN:
+                return
+            self._probing = True
+        threading.Thread(target=self._probe, name="circuit-probe", daemon=True).start()
+    
+    def _probe(self) -> None:
+        """Run probe_fn; close the circuit on success, restart the timeout on failure."""
+        try:
+            self.probe_fn()
+        except Exception as e:
+            logger.warning("Circuit probe failed, staying OPEN: %.100s", e)
+            self._last_failure_time = time.monotonic()
+        else:
+            logger.info("Circuit probe succeeded, closing circuit")
+            self._on_success()
+        finally:
+            self._probing = False
+    
     def call(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
         """
         Execute a function through the circuit breaker.
@@ -211,14 +399,31 @@ class CircuitBreaker:
         Raises:
             CircuitOpenError: If circuit is open and rejecting calls
         """
+        return self._dispatch(func, args, kwargs)
+    
+    def _dispatch_closed(self, func: Callable[..., Any], args: tuple, kwargs: dict) -> Any:
+        """Healthy circuit: no recovery check or half-open bookkeeping."""
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            self._on_failure(e)
+            raise
+        # A slow call can finish after others opened the circuit; only a
+        # still-CLOSED breaker may forget its failures
+        if self._state is _CLOSED:
+            self._failures = 0
+        return result
+    
+    def _dispatch_guarded(self, func: Callable[..., Any], args: tuple, kwargs: dict) -> Any:
+        """OPEN / HALF_OPEN: run the full state machine."""
         current_state = self.state  # This checks for recovery
         
-        if current_state == CircuitState.OPEN:
+        if current_state is _OPEN:
             logger.warning(
                 "Circuit OPEN - rejecting call to %s (failures: %d, recovery in: %.1fs)",
                 func.__name__,
                 self._failures,
-                self.recovery_timeout - (time.time() - (self._last_failure_time or 0))
+                self.recovery_timeout - (time.monotonic() - (self._last_failure_time or 0))
             )
             metrics.record_circuit_break()
             raise CircuitOpenError(
@@ -226,14 +431,20 @@ class CircuitBreaker:
                 f"Failures: {self._failures}"
             )
         
-        if current_state == CircuitState.HALF_OPEN:
-            if self._half_open_calls >= self.half_open_max_calls:
+        if current_state is _HALF_OPEN:
+            # Check-and-increment atomically so concurrent callers can't all
+            # slip past the limit and flood a recovering backend
+            with self._half_open_lock:
+                admitted = self._half_open_calls < self.half_open_max_calls
+                if admitted:
+                    self._half_open_calls += 1
+                    test_call = self._half_open_calls
+            if not admitted:
                 logger.warning("Circuit HALF_OPEN - max test calls reached, rejecting")
                 raise CircuitOpenError("Circuit half-open, max test calls reached")
-            self._half_open_calls += 1
             logger.info(
                 "Circuit HALF_OPEN - allowing test call %d/%d to %s",
-                self._half_open_calls,
+                test_call,
                 self.half_open_max_calls,
                 func.__name__
             )
@@ -248,27 +459,30 @@ class CircuitBreaker:
     
     def _on_success(self) -> None:
         """Handle successful call."""
-        if self._state == CircuitState.HALF_OPEN:
+        if self._state is _HALF_OPEN:
             logger.info("Circuit recovering - test call succeeded, closing circuit")
         
         self._failures = 0
-        self._state = CircuitState.CLOSED
+        self._state = _CLOSED
         self._half_open_calls = 0
+        self._dispatch = self._dispatch_closed
     
     def _on_failure(self, error: Exception) -> None:
         """Handle failed call."""
         self._failures += 1
-        self._last_failure_time = time.time()
+        self._last_failure_time = time.monotonic()
         
         logger.warning(
-            "Circuit recorded failure %d/%d: %s",
+            "Circuit recorded failure %d/%d: %.100s",
             self._failures,
             self.failure_threshold,
-            str(error)[:100]
+            error
         )
         
-        if self._failures >= self.failure_threshold:
-            self._state = CircuitState.OPEN
+        # A failed test call reopens at once, whatever the failure count
+        if self._state is _HALF_OPEN or self._failures >= self.failure_threshold:
+            self._state = _OPEN
+            self._dispatch = self._dispatch_guarded
             logger.error(
                 "Circuit OPENED after %d failures. Will retry in %.1fs",
                 self._failures,
@@ -280,9 +494,10 @@ class CircuitBreaker:
         """Manually reset the circuit breaker."""
         logger.info("Circuit manually reset")
         self._failures = 0
-        self._state = CircuitState.CLOSED
+        self._state = _CLOSED
         self._last_failure_time = None
         self._half_open_calls = 0
+        self._dispatch = self._dispatch_closed
 
 
 # =============================================================================
@@ -292,6 +507,163 @@ class CircuitBreaker:
 T = TypeVar('T')
 
 
+class _Retry:
+    """
+    Callable produced by retry_with_backoff.
+    
+    The first attempt runs inline; the backoff loop lives in a separate cold
+    method so the common success path stays small. Settings are slot
+    attributes rather than closure cells.
+    
+    With a `breaker`, every attempt goes straight through the breaker's
+    current dispatch handler, so retry and circuit breaking share one call
+    chain and one metrics record. A CircuitOpenError stops retrying; if
+    this call's own failed attempts tripped the circuit, it is still
+    recorded as one failed call.
+    """
+    __slots__ = (
+        "func", "max_retries", "delays", "jitter", "rng", "retryable_exceptions",
+        "breaker",
+        "__dict__",  # for functools.update_wrapper
+    )
+    
+    def __init__(
+        self,
+        func: Callable[..., T],
+        max_retries: int,
+        base_delay: float,
+        max_delay: float,
+        exponential_base: float,
+        jitter: bool,
+        retryable_exceptions: tuple,
+        breaker: Optional[CircuitBreaker] = None,
+    ):
+        self.func = func
+        self.max_retries = max_retries
+        # Backoff schedule is fixed at decoration time
+        self.delays = tuple(
+            min(base_delay * (exponential_base ** attempt), max_delay)
+            for attempt in range(max_retries)
+        )
+        self.jitter = jitter
+        # Own generator so jitter doesn't share (or perturb) the global stream
+        self.rng = random.Random()
+        self.retryable_exceptions = retryable_exceptions
+        self.breaker = breaker
+        functools.update_wrapper(self, func)
+    
+    def __get__(self, obj: Any, objtype: Optional[type] = None) -> Any:
+        # Bind like a plain function when used on a method
+        if obj is None:
+            return self
+        return types.MethodType(self, obj)
+    
+    def __call__(self, *args: Any, **kwargs: Any) -> T:
+        breaker = self.breaker
+        start_time = time.monotonic()
+        try:
+            if breaker is None:
+                result = self.func(*args, **kwargs)
+            else:
+                result = breaker._dispatch(self.func, args, kwargs)
+        except self.retryable_exceptions as e:
+            return self._retry_loop(e, args, kwargs)
+        except CircuitOpenError:
+            # Already logged and counted by the breaker
+            raise
+        except Exception as e:
+            self._non_retryable(e, 0)
+            raise
+        
+        metrics.record_call(
+            success=True,
+            latency_ms=(time.monotonic() - start_time) * 1000,
+            retries=0
+        )
+        return result
+    
+    def _retry_loop(self, error: Exception, args: tuple, kwargs: dict) -> T:
+        """Back off and retry after the first attempt failed."""
+        func = self.func
+        breaker = self.breaker
+        max_retries = self.max_retries
+        jitter = self.jitter
+        rng_random = self.rng.random
+        
+        for attempt, delay in enumerate(self.delays):
+            # Add jitter (±25%) to prevent thundering herd
+            if jitter:
+                delay = delay * (0.75 + rng_random() * 0.5)
+            
+            logger.warning(
+                "Retry %d/%d for %s after %.2fs: %.100s",
+                attempt + 1,
+                max_retries,
+                func.__name__,
+                delay,
+                error
+            )
+            
+            time.sleep(delay)
+            
+            retries_used = attempt + 1
+            try:
+                start_time = time.monotonic()
+                if breaker is None:
+                    result = func(*args, **kwargs)
+                else:
+                    result = breaker._dispatch(func, args, kwargs)
+                latency_ms = (time.monotonic() - start_time) * 1000
+            except self.retryable_exceptions as e:
+                error = e
+                continue
+            except CircuitOpenError:
+                # Our own failed attempts tripped the circuit; count the call
+                # (this rejected attempt never ran, so it isn't a retry)
+                metrics.record_call(success=False, latency_ms=0, retries=attempt)
+                raise
+            except Exception as e:
+                self._non_retryable(e, retries_used)
+                raise
+            
+            metrics.record_call(
+                success=True,
+                latency_ms=latency_ms,
+                retries=retries_used
+            )
+            logger.info(
+                "Call to %s succeeded after %d retries (%.2fms)",
+                func.__name__,
+                retries_used,
+                latency_ms
+            )
+            return result
+        
+        logger.error(
+            "Max retries (%d) exceeded for %s: %s",
+            max_retries,
+            func.__name__,
+            error
+        )
+        metrics.record_call(
+            success=False,
+            latency_ms=0,
+            retries=max_retries + 1
+        )
+        raise MaxRetriesExceededError(
+            f"Failed after {max_retries} retries: {error}"
+        ) from error
+    
+    def _non_retryable(self, error: Exception, retries_used: int) -> None:
+        """Log and record an error that should not be retried."""
+        logger.error(
+            "Non-retryable error in %s: %s",
+            self.func.__name__,
+            error
+        )
+        metrics.record_call(success=False, latency_ms=0, retries=retries_used)
+
+
 def retry_with_backoff(
     max_retries: int = 3,
     base_delay: float = 1.0,
@@ -317,89 +689,15 @@ def retry_with_backoff(
             return api.get(f"/users/{user_id}")
     """
     def decorator(func: Callable[..., T]) -> Callable[..., T]:
-        @functools.wraps(func)
-        def wrapper(*args: Any, **kwargs: Any) -> T:
-            last_exception: Optional[Exception] = None
-            retries_used = 0
-            
-            for attempt in range(max_retries + 1):
-                try:
-                    start_time = time.time()
-                    result = func(*args, **kwargs)
-                    latency_ms = (time.time() - start_time) * 1000
-                    
-                    # Record successful call
-                    metrics.record_call(
-                        success=True,
-                        latency_ms=latency_ms,
-                        retries=retries_used
-                    )
-                    
-                    if retries_used > 0:
-                        logger.info(
-                            "Call to %s succeeded after %d retries (%.2fms)",
-                            func.__name__,
-                            retries_used,
-                            latency_ms
-                        )
-                    
-                    return result
-                    
-                except retryable_exceptions as e:
-                    last_exception = e
-                    retries_used = attempt + 1
-                    
-                    if attempt == max_retries:
-                        logger.error(
-                            "Max retries (%d) exceeded for %s: %s",
-                            max_retries,
-                            func.__name__,
-                            str(e)
-                        )
-                        metrics.record_call(
-                            success=False,
-                            latency_ms=0,
-                            retries=retries_used
-                        )
-                        raise MaxRetriesExceededError(
-                            f"Failed after {max_retries} retries: {e}"
-                        ) from e
-                    
-                    # Calculate delay with exponential backoff
-                    delay = min(
-                        base_delay * (exponential_base ** attempt),
-                        max_delay
-                    )
-                    
-                    # Add jitter (±25%) to prevent thundering herd
-                    if jitter:
-                        delay = delay * (0.75 + random.random() * 0.5)
-                    
-                    logger.warning(
-                        "Retry %d/%d for %s after %.2fs: %s",
-                        attempt + 1,
-                        max_retries,
-                        func.__name__,
-                        delay,
-                        str(e)[:100]
-                    )
-                    
-                    time.sleep(delay)
-                    
-                except Exception as e:
-                    # Non-retryable exception
-                    logger.error(
-                        "Non-retryable error in %s: %s",
-                        func.__name__,
-                        str(e)
-                    )
-                    metrics.record_call(success=False, latency_ms=0, retries=retries_used)
-                    raise
-            
-            # Should never reach here, but just in case
-            raise MaxRetriesExceededError(f"Unexpected retry failure: {last_exception}")
-        
-        return wrapper
+        return _Retry(
+            func,
+            max_retries,
+            base_delay,
+            max_delay,
+            exponential_base,
+            jitter,
+            retryable_exceptions,
+        )
     return decorator
 
 
@@ -414,6 +712,7 @@ class ResilientAPIClient:
     Features:
         - Automatic retry with exponential backoff
         - Circuit breaker for failing services
+        - Bulkhead capping concurrent in-flight requests
         - Structured logging
         - Metrics collection
         
@@ -427,38 +726,59 @@ class ResilientAPIClient:
         base_url: str,
         timeout: float = 30.0,
         circuit_breaker: Optional[CircuitBreaker] = None,
+        bulkhead_size: int = 32,
     ):
         self.base_url = base_url.rstrip("/")
         self.timeout = timeout
         self.circuit_breaker = circuit_breaker or CircuitBreaker()
+        # Bounds in-flight requests so a slow backend can't pile up threads
+        self._bulkhead = threading.BoundedSemaphore(bulkhead_size)
         self.logger = logging.getLogger(f"api_client.{base_url}")
+        # Retry and circuit breaker fused into one wrapper around _make_request
+        self._execute = _Retry(
+            self._make_request,
+            max_retries=3,
+            base_delay=1.0,
+            max_delay=60.0,
+            exponential_base=2.0,
+            jitter=True,
+            retryable_exceptions=(TransientError, ConnectionError, TimeoutError),
+            breaker=self.circuit_breaker,
+        )
     
-    @retry_with_backoff(max_retries=3, base_delay=1.0)
     def _make_request(self, method: str, endpoint: str, **kwargs: Any) -> dict:
         """
         Make an HTTP request (mock implementation).
         
         In production, replace with actual HTTP client (httpx, requests, aiohttp).
-        """
-        url = f"{self.base_url}{endpoint}"
-        
-        self.logger.debug("Making %s request to %s", method, url)
         
-        # Simulate API call - replace with real implementation
-        # Example with httpx:
-        # response = httpx.request(method, url, timeout=self.timeout, **kwargs)
-        # response.raise_for_status()
-        # return response.json()
-        
-        # Mock: randomly fail to demonstrate retry/circuit breaker
-        if random.random() < 0.3:  # 30% failure rate for demo
-            if random.random() < 0.5:
-                raise ServiceUnavailableError("Service temporarily unavailable")
-            else:
-                raise RateLimitError("Rate limit exceeded")
-        
-        # Mock success response
-        return {"status": "ok", "url": url, "method": method}
+        Raises:
+            ServiceUnavailableError: If no bulkhead slot frees up within timeout
+        """
+        if not self._bulkhead.acquire(timeout=self.timeout):
+            raise ServiceUnavailableError("Bulkhead full - too many requests in flight")
+        try:
+            url = f"{self.base_url}{endpoint}"
+            
+            self.logger.debug("Making %s request to %s", method, url)
+            
+            # Simulate API call - replace with real implementation
+            # Example with httpx:
+            # response = httpx.request(method, url, timeout=self.timeout, **kwargs)
+            # response.raise_for_status()
+            # return response.json()
+            
+            # Mock: randomly fail to demonstrate retry/circuit breaker
+            if random.random() < 0.3:  # 30% failure rate for demo
+                if random.random() < 0.5:
+                    raise ServiceUnavailableError("Service temporarily unavailable")
+                else:
+                    raise RateLimitError("Rate limit exceeded")
+            
+            # Mock success response
+            return {"status": "ok", "url": url, "method": method}
+        finally:
+            self._bulkhead.release()
     
     def request(self, method: str, endpoint: str, **kwargs: Any) -> dict:
         """
@@ -476,12 +796,7 @@ class ResilientAPIClient:
             CircuitOpenError: If circuit breaker is open
             MaxRetriesExceededError: If all retries exhausted
         """
-        return self.circuit_breaker.call(
-            self._make_request,
-            method,
-            endpoint,
-            **kwargs
-        )
+        return self._execute(method, endpoint, **kwargs)
     
     def get(self, endpoint: str, **kwargs: Any) -> dict:
         """Make a GET request."""
@@ -507,12 +822,12 @@ class ResilientAPIClient:
 @contextmanager
 def timed_operation(operation_name: str):
     """Context manager to log operation timing."""
-    start = time.time()
+    start = time.monotonic()
     logger.info("Starting: %s", operation_name)
     try:
         yield
     finally:
-        elapsed = (time.time() - start) * 1000
+        elapsed = (time.monotonic() - start) * 1000
         logger.info("Completed: %s (%.2fms)", operation_name, elapsed)
 
 
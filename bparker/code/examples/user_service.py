@@ -47,7 +47,15 @@ class MockDatabase:
         """
         # In a real implementation, this would execute actual SQL
         # For demo purposes, we just look up by ID
-        user_id = params[0] if params else None
+        return self.get_by_id(params[0] if params else None)
+    
+    def get_by_id(self, user_id: Optional[int]) -> Optional[dict[str, Any]]:
+        """
+        Look up a user row by primary key, skipping the SQL layer.
+        
+        Mock-only fast path for callers (e.g. benchmarks) that don't need
+        to exercise query().
+        """
         return self._users.get(user_id)
 
 
@@ -1,8 +1,14 @@
 #!/usr/bin/env python3
-"""Generate branded product mockup images for AutoNateAI shop. v3"""
+"""Generate branded product mockup images for AutoNateAI shop. v3
+
+Requires Pillow and NumPy:  pip install pillow numpy
+"""
 
 from PIL import Image, ImageDraw, ImageFont, ImageFilter
-import os, random, math
+import numpy as np
+import os, random, zlib
+from functools import lru_cache
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
 
 ASSETS_DIR = os.path.dirname(os.path.abspath(__file__))
 LOGO_PATH = os.path.join(ASSETS_DIR, 'logo-transparent.png')
@@ -19,28 +25,32 @@ GREEN = (102, 187, 106)
 PURPLE = (171, 71, 188)
 
 
+@lru_cache(maxsize=1)
 def load_logo():
+    # Shared read-only: paste_logo only ever pastes resized copies of it
     return Image.open(LOGO_PATH).convert('RGBA')
 
 
 def make_bg(accent=ICE):
     """Pure dark background with pixel-level radial vignette — no overlapping shapes."""
-    img = Image.new('RGB', (SIZE, SIZE), DEEP)
-    px = img.load()
-    # Very subtle radial glow — compute per-pixel
-    for y in range(SIZE):
-        for x in range(SIZE):
-            dx = (x - CX) / 300
-            dy = (y - CY + 30) / 300
-            d = math.sqrt(dx*dx + dy*dy)
-            if d < 1.0:
-                f = (1.0 - d) ** 2  # smooth quadratic falloff
-                blend = f * 0.06  # very subtle — max 6% blend
-                r = int(DEEP[0] + (accent[0] - DEEP[0]) * blend)
-                g = int(DEEP[1] + (accent[1] - DEEP[1]) * blend)
-                b = int(DEEP[2] + (accent[2] - DEEP[2]) * blend)
-                px[x, y] = (r, g, b)
-    return img.convert('RGBA')
+    # Callers draw on the result, so hand out a copy of the cached render
+    return _make_bg_cached(tuple(accent)).copy()
+
+
+@lru_cache(maxsize=8)
+def _make_bg_cached(accent):
+    # Very subtle radial glow — computed for every pixel at once
+    dy, dx = np.ogrid[:SIZE, :SIZE]
+    dx = (dx - CX) / 300
+    dy = (dy - CY + 30) / 300
+    d = np.sqrt(dx*dx + dy*dy)
+    # Smooth quadratic falloff, quantized to 256 steps (0 outside the disk)
+    idx = (np.clip(1.0 - d, 0.0, 1.0) ** 2 * 255).astype(np.uint8)
+    # Colour per step — very subtle, max 6% blend — gathered in one lookup
+    deep = np.array(DEEP, dtype=np.float64)
+    blend = np.linspace(0.0, 0.06, 256)[:, None]
+    lut = (deep + (np.array(accent, dtype=np.float64) - deep) * blend).astype(np.uint8)
+    return Image.fromarray(lut[idx], 'RGB')
 
 
 def add_stars(img, seed=42, count=70):
@@ -54,21 +64,31 @@ def add_stars(img, seed=42, count=70):
         draw.ellipse([x, y, x+sz, y+sz], fill=c)
 
 
+# Probe the filesystem once, not on every get_font call
+_FONT_PATHS = [fp for fp in ['/Library/Fonts/SF-Pro-Display-Bold.otf',
+                             '/System/Library/Fonts/Helvetica.ttc',
+                             '/System/Library/Fonts/SFCompactDisplay.ttf']
+               if os.path.exists(fp)]
+
+
+@lru_cache(maxsize=32)
 def get_font(size):
-    for fp in ['/Library/Fonts/SF-Pro-Display-Bold.otf',
-               '/System/Library/Fonts/Helvetica.ttc',
-               '/System/Library/Fonts/SFCompactDisplay.ttf']:
-        if os.path.exists(fp):
-            try: return ImageFont.truetype(fp, size)
-            except: continue
+    for fp in _FONT_PATHS:
+        try: return ImageFont.truetype(fp, size)
+        except: continue
     return ImageFont.load_default()
 
 
+@lru_cache(maxsize=256)
+def _text_width(text, size):
+    bb = get_font(size).getbbox(text)
+    return bb[2] - bb[0]
+
+
 def text_c(draw, text, y, size=24, color=WHITE, alpha=255):
     """Draw centered text."""
     font = get_font(size)
-    bb = draw.textbbox((0, 0), text, font=font)
-    w = bb[2] - bb[0]
+    w = _text_width(text, size)
     draw.text(((SIZE-w)//2, y), text, fill=(*color, alpha), font=font)
 
 
@@ -114,12 +134,20 @@ def draw_mug(draw, yoff=0, c=ICE, alpha=50):
                            outline=(*c, alpha), fill=(*c, alpha//5), width=2)
     # Handle
     draw.arc([CX+90, t+60, CX+185, t+215], 270, 90, fill=(*c, alpha), width=2)
-    # Steam
-    for i, sx in enumerate([CX-25, CX, CX+25]):
+    # Steam — the canvas is RGB, so arc alpha never showed; stamp one mask
+    draw.bitmap((CX-31, t-67), _steam_mask(), fill=(*c, max(alpha // 3, 5)))
+
+
+@lru_cache(maxsize=1)
+def _steam_mask():
+    """The mug's 3x4 steam arcs as a 1-bit mask, origin at (CX-31, top-67)."""
+    mask = Image.new('1', (63, 61))
+    draw = ImageDraw.Draw(mask)
+    for i, sx in enumerate([6, 31, 56]):
         for j in range(4):
-            y1 = t - 15 - j * 12 - i * 4
-            a = max(alpha // 3 - j * 6, 5)
-            draw.arc([sx-6, y1-8, sx+6, y1+8], 200, 340, fill=(*c, a), width=1)
+            y1 = 52 - j * 12 - i * 4
+            draw.arc([sx-6, y1-8, sx+6, y1+8], 200, 340, fill=1, width=1)
+    return mask
 
 
 def bottom_bar(draw, text):
@@ -127,7 +155,10 @@ def bottom_bar(draw, text):
     text_c(draw, text, SIZE - 36, size=11, color=WHITE, alpha=140)
 
 
-def paste_logo(img, logo, size, y):
+_RESIZED_LOGOS = {}
+
+
+def paste_logo(img, logo, size, y, resample=Image.LANCZOS):
     """Resize and center-paste logo onto image."""
     # Maintain aspect ratio
     lw, lh = logo.size
@@ -138,17 +169,54 @@ def paste_logo(img, logo, size, y):
     else:
         nh = size
         nw = int(size * ratio)
-    lr = logo.resize((nw, nh), Image.LANCZOS)
+    key = (id(logo), nw, nh, resample)
+    if key not in _RESIZED_LOGOS:
+        # Pillow ignores reducing_gap for RGBA, so premultiply ourselves: the
+        # cheap box reduce shrinks the input before the full filter runs
+        lr = logo.convert('RGBa').resize((nw, nh), resample, reducing_gap=2.0)
+        # Keep the source alive alongside its resize so its id can't be reused
+        _RESIZED_LOGOS[key] = (logo, lr.convert('RGBA'))
+    lr = _RESIZED_LOGOS[key][1]
     img.paste(lr, ((SIZE - nw) // 2, y), lr)
     return img
 
 
+# Encoding releases the GIL, so the next generator can draw while this one saves
+_SAVE_POOL = ThreadPoolExecutor(max_workers=4)
+
+
+def save_async(img, filename, quality=90, note=''):
+    """Encode and write on a background thread; returns the Future."""
+    def save():
+        img.save(os.path.join(ASSETS_DIR, filename), quality=quality)
+        print(f'  ✓ {filename}{note}')
+    return _SAVE_POOL.submit(save)
+
+
+def cached(filename, source=LOGO_PATH):
+    """Finished Future if the output is newer than its source and this script."""
+    try:
+        out = os.path.getmtime(os.path.join(ASSETS_DIR, filename))
+        fresh = out >= max(os.path.getmtime(source), os.path.getmtime(__file__))
+    except OSError:
+        return None  # no output yet (a missing source fails in the generator)
+    if not fresh:
+        return None
+    print(f'  = {filename} (cached)')
+    done = Future()
+    done.set_result(None)
+    return done
+
+
 # ─── GENERATORS ───
 
 def gen_tee(name, subtitle, accent, filename):
+    done = cached(filename)
+    if done:
+        return done
     logo = load_logo()
     img = make_bg(accent)
-    add_stars(img, seed=hash(filename) % 9999)
+    add_stars(img, seed=zlib.crc32(filename.encode()))
 
     draw = ImageDraw.Draw(img)
     draw_tee(draw, yoff=10, c=accent, alpha=55)
@@ -161,14 +229,16 @@ def gen_tee(name, subtitle, accent, filename):
     text_c(draw, subtitle, 508, size=14, color=WHITE, alpha=100)
     bottom_bar(draw, 'PREMIUM TEE  ·  100% COTTON  ·  UNISEX FIT')
 
-    img.convert('RGB').save(os.path.join(ASSETS_DIR, filename), quality=90)
-    print(f'  ✓ {filename}')
+    return save_async(img, filename)
 
 
 def gen_hoodie(name, subtitle, accent, filename):
+    done = cached(filename)
+    if done:
+        return done
     logo = load_logo()
     img = make_bg(accent)
-    add_stars(img, seed=hash(filename) % 9999)
+    add_stars(img, seed=zlib.crc32(filename.encode()))
 
     draw = ImageDraw.Draw(img)
     draw_hoodie(draw, yoff=5, c=accent, alpha=55)
@@ -181,14 +251,16 @@ def gen_hoodie(name, subtitle, accent, filename):
     text_c(draw, subtitle, 496, size=14, color=WHITE, alpha=100)
     bottom_bar(draw, 'PREMIUM HOODIE  ·  HEAVYWEIGHT FLEECE  ·  UNISEX')
 
-    img.convert('RGB').save(os.path.join(ASSETS_DIR, filename), quality=90)
-    print(f'  ✓ {filename}')
+    return save_async(img, filename)
 
 
 def gen_mug(name, subtitle, filename):
+    done = cached(filename)
+    if done:
+        return done
     logo = load_logo()
     img = make_bg(ICE)
-    add_stars(img, seed=hash(filename) % 9999)
+    add_stars(img, seed=zlib.crc32(filename.encode()))
 
     draw = ImageDraw.Draw(img)
     draw_mug(draw, yoff=0, c=ICE, alpha=50)
@@ -201,11 +273,13 @@ def gen_mug(name, subtitle, filename):
     text_c(draw, subtitle, 567, size=13, color=WHITE, alpha=100)
     bottom_bar(draw, 'CERAMIC MUG  ·  11 OZ  ·  DISHWASHER SAFE')
 
-    img.convert('RGB').save(os.path.join(ASSETS_DIR, filename), quality=90)
-    print(f'  ✓ {filename}')
+    return save_async(img, filename)
 
 
 def gen_stickers(filename):
+    done = cached(filename)
+    if done:
+        return done
     logo = load_logo()
     img = make_bg(PURPLE)
     add_stars(img, seed=77, count=50)
@@ -225,11 +299,13 @@ def gen_stickers(filename):
     text_c(draw, '10 Premium Die-Cut Stickers', 510, size=13, color=WHITE, alpha=100)
     bottom_bar(draw, 'PACK OF 10  ·  VINYL  ·  WATERPROOF  ·  UV RESISTANT')
 
-    img.convert('RGB').save(os.path.join(ASSETS_DIR, filename), quality=90)
-    print(f'  ✓ {filename}')
+    return save_async(img, filename)
 
 
 def gen_coasters(filename):
+    done = cached(filename)
+    if done:
+        return done
     logo = load_logo()
     img = make_bg(ICE)
     add_stars(img, seed=55, count=50)
@@ -247,13 +323,15 @@ def gen_coasters(filename):
     text_c(draw, 'Set of 4 Cork-Backed Coasters', 522, size=13, color=WHITE, alpha=100)
     bottom_bar(draw, 'SET OF 4  ·  CORK-BACKED  ·  DEVELOPER THEMED')
 
-    img.convert('RGB').save(os.path.join(ASSETS_DIR, filename), quality=90)
-    print(f'  ✓ {filename}')
+    return save_async(img, filename)
 
 
 def reformat_women_tee(filename):
+    done = cached(filename, WOMEN_TEE_SRC)
+    if done:
+        return done
     src = Image.open(WOMEN_TEE_SRC).convert('RGBA')
-    img = Image.new('RGBA', (SIZE, SIZE), DEEP)
+    img = Image.new('RGB', (SIZE, SIZE), DEEP)
     add_stars(img, seed=33, count=40)
 
     # Crop to front tee
@@ -269,25 +347,43 @@ def reformat_women_tee(filename):
     draw = ImageDraw.Draw(img)
     bottom_bar(draw, 'WOMEN IN TECH COLLECTION  ·  PREMIUM TEE')
 
-    img.convert('RGB').save(os.path.join(ASSETS_DIR, filename), quality=92)
-    print(f'  ✓ {filename} (reformatted)')
+    return save_async(img, filename, quality=92, note=' (reformatted)')
+
+
+def _run_batch(batch):
+    # Queue every save first, then wait, so encoding overlaps drawing
+    futures = []
+    try:
+        for fn, args in batch:
+            futures.append(fn(*args))
+    finally:
+        wait(futures)  # let queued saves finish even if a generator raised
+    for f in futures:
+        f.result()  # re-raise any save error
 
 
 if __name__ == '__main__':
     print('Generating AutoNateAI shop mockups v3...\n')
 
-    gen_tee('AI NEXUS', 'Represent the Future of Technology', ICE, 'ai-nexus-tee.png')
-    gen_tee('FUTURE OF AI', 'Limited Edition Design', GREEN, 'future-ai-tee.png')
-    gen_tee('CIRCUIT BOARD', 'For the Hardware-Minded Dev', ICE, 'circuit-tee.png')
-    gen_tee('AI ORIGIN DROP', 'Exclusive Limited Edition', RED, 'ai-origin-drop-tee.png')
+    # Every generator writes its own file, so they can run in parallel;
+    # each worker process fills its own logo/background/font caches
+    jobs = [
+        (gen_tee, ('AI NEXUS', 'Represent the Future of Technology', ICE, 'ai-nexus-tee.png')),
+        (gen_tee, ('FUTURE OF AI', 'Limited Edition Design', GREEN, 'future-ai-tee.png')),
+        (gen_tee, ('CIRCUIT BOARD', 'For the Hardware-Minded Dev', ICE, 'circuit-tee.png')),
+        (gen_tee, ('AI ORIGIN DROP', 'Exclusive Limited Edition', RED, 'ai-origin-drop-tee.png')),
 
-    gen_hoodie('MATRIX DEV', 'Live in the Matrix', ICE, 'matrix-dev-hoodie.png')
-    gen_hoodie('BOT LIFE', 'We Bot Dat Life', PURPLE, 'bot-life-hoodie.png')
+        (gen_hoodie, ('MATRIX DEV', 'Live in the Matrix', ICE, 'matrix-dev-hoodie.png')),
+        (gen_hoodie, ('BOT LIFE', 'We Bot Dat Life', PURPLE, 'bot-life-hoodie.png')),
 
-    gen_mug('AI SYNTAX MUG', 'Fuel Your Coding Sessions', 'ai-syntax-mug.png')
-    gen_stickers('sticker-pack.png')
-    gen_coasters('dev-coaster-set.png')
+        (gen_mug, ('AI SYNTAX MUG', 'Fuel Your Coding Sessions', 'ai-syntax-mug.png')),
+        (gen_stickers, ('sticker-pack.png',)),
+        (gen_coasters, ('dev-coaster-set.png',)),
 
-    reformat_women_tee('women-in-tech-tee.png')
+        (reformat_women_tee, ('women-in-tech-tee.png',)),
+    ]
+    workers = min(os.cpu_count() or 1, len(jobs))
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        list(ex.map(_run_batch, [jobs[i::workers] for i in range(workers)]))
 
     print('\nDone!')
@@ -6,6 +6,7 @@ Dark mode theme matching the platform design.
 
 from fpdf import FPDF
 from datetime import datetime
+from itertools import groupby
 
 # Dark theme colors
 BG_PRIMARY = (10, 10, 15)
@@ -20,8 +21,43 @@ SUCCESS = (102, 187, 106)
 DANGER = (239, 83, 80)
 WARNING = (255, 183, 77)
 
+# Font + text colour pairs shared by the AuditPDF helpers
+_TITLE_STATE = ("Helvetica", "B", 14, ACCENT)
+_BODY_STATE = ("Helvetica", "", 9, TEXT_SECONDARY)
+_FILE_STATE = ("Helvetica", "B", 10, TEXT_PRIMARY)
+_BADGE_STATE = ("Helvetica", "B", 8, TEXT_PRIMARY)
+
 
 class AuditPDF(FPDF):
+    # Last font / text colour requested, so repeated setters become no-ops
+    _last_font = None
+    _last_color = None
+
+    def add_page(self, *args, **kwargs):
+        super().add_page(*args, **kwargs)
+        # add_page restores font and colour behind our back
+        self._last_font = self._last_color = None
+
+    def set_font(self, family=None, style="", size=0):
+        key = (family, style, size)
+        if key == self._last_font:
+            return
+        super().set_font(family, style, size)
+        self._last_font = key
+
+    def set_text_color(self, r, g=-1, b=-1):
+        key = (r, g, b)
+        if key == self._last_color:
+            return
+        super().set_text_color(r, g, b)
+        self._last_color = key
+
+    def _apply(self, state, color=None):
+        """Set font and text colour from a *_STATE tuple, optionally recoloured."""
+        family, style, size, default = state
+        self.set_font(family, style, size)
+        self.set_text_color(*(color or default))
+
     def header(self):
         self.set_fill_color(*BG_PRIMARY)
         self.rect(0, 0, 210, 18, "F")
@@ -43,8 +79,7 @@ class AuditPDF(FPDF):
         self.rect(0, 0, 210, 297, "F")
 
     def section_title(self, title):
-        self.set_font("Helvetica", "B", 14)
-        self.set_text_color(*ACCENT)
+        self._apply(_TITLE_STATE)
         self.cell(0, 10, title, ln=True)
         self.set_draw_color(*ACCENT_DIM)
         self.line(self.l_margin, self.get_y(), 200, self.get_y())
@@ -57,14 +92,12 @@ class AuditPDF(FPDF):
         self.ln(2)
 
     def body_text(self, text):
-        self.set_font("Helvetica", "", 9)
-        self.set_text_color(*TEXT_SECONDARY)
+        self._apply(_BODY_STATE)
         self.multi_cell(0, 5, text)
         self.ln(2)
 
     def bullet(self, text, color=TEXT_SECONDARY):
-        self.set_font("Helvetica", "", 9)
-        self.set_text_color(*color)
+        self._apply(_BODY_STATE, color)
         x = self.get_x()
         self.cell(8, 5, "-")
         self.set_x(x + 8)
@@ -84,8 +117,7 @@ class AuditPDF(FPDF):
         self.set_y(y_end + 4)
 
     def status_badge(self, text, color):
-        self.set_font("Helvetica", "B", 8)
-        self.set_text_color(*color)
+        self._apply(_BADGE_STATE, color)
         self.cell(20, 5, text)
 
     def file_issue(self, filename, severity, issues):
@@ -99,14 +131,12 @@ class AuditPDF(FPDF):
             y_start = self.get_y()
 
         # File name
-        self.set_font("Helvetica", "B", 10)
-        self.set_text_color(*TEXT_PRIMARY)
+        self._apply(_FILE_STATE)
         self.cell(120, 7, filename)
 
         # Severity badge
         sev_color = DANGER if severity == "HIGH" else WARNING if severity == "MEDIUM" else SUCCESS
-        self.set_font("Helvetica", "B", 8)
-        self.set_text_color(*sev_color)
+        self._apply(_BADGE_STATE, sev_color)
         self.cell(0, 7, f"[{severity}]", ln=True)
 
         # Issues
@@ -198,8 +228,8 @@ def build_pdf():
         ]),
     ]
 
+    pdf.set_fill_color(*BG_CARD)  # nothing below changes it; add_page restores it
     for section_name, items in sections:
-        pdf.set_fill_color(*BG_CARD)
         y_s = pdf.get_y()
         pdf.set_font("Helvetica", "B", 10)
         pdf.set_text_color(*ACCENT)
@@ -209,8 +239,7 @@ def build_pdf():
             pdf.set_text_color(*TEXT_SECONDARY)
             pdf.cell(0, 5, f"      {label}  ->  {href}", ln=True)
         y_e = pdf.get_y()
-        pdf.set_fill_color(*BG_CARD)
-        pdf.rect(self_l_margin := 10, y_s - 1, 190, y_e - y_s + 3, "F")
+        pdf.rect(pdf.l_margin, y_s - 1, 190, y_e - y_s + 3, "F")
         pdf.set_y(y_e + 4)
 
     # ── PAGE 3: Consistency Matrix ──
@@ -260,6 +289,7 @@ def build_pdf():
     pdf.ln()
 
     # Table rows
+    pdf.set_font("Helvetica", "", 7)
     for page in pages:
         if pdf.get_y() > 270:
             pdf.add_page()
@@ -270,17 +300,15 @@ def build_pdf():
         bg = (30, 20, 20) if row_has_issue else BG_CARD
         pdf.set_fill_color(*bg)
 
-        pdf.set_font("Helvetica", "", 7)
         pdf.set_text_color(*TEXT_PRIMARY)
         pdf.cell(col_w_page, 5, page, border=0, fill=True)
 
-        for val in row_data:
-            if val:
-                pdf.set_text_color(*SUCCESS)
-                pdf.cell(col_w, 5, "OK", border=0, fill=True, align="C")
-            else:
-                pdf.set_text_color(*DANGER)
-                pdf.cell(col_w, 5, "MISS", border=0, fill=True, align="C")
+        # One colour switch per run of equal cells, not per cell
+        for val, run in groupby(row_data):
+            pdf.set_text_color(*(SUCCESS if val else DANGER))
+            text = "OK" if val else "MISS"
+            for _ in run:
+                pdf.cell(col_w, 5, text, border=0, fill=True, align="C")
         pdf.ln()
 
     pdf.ln(4)